@@ -0,0 +1,59 @@
+"""
+Script to fill articles.published_at from the raw published text
+Run this once after upgrading; new articles get published_at at ingest
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import update
+from src.models import SessionLocal, Article, init_db
+from src.worker import parse_published
+
+# Rows parsed and updated per transaction
+BATCH_SIZE = 1000
+
+def backfill_published_at():
+    init_db()
+    db = SessionLocal()
+    try:
+        last_id = 0
+        updated = 0
+        unparsed = 0
+        while True:
+            # Walk by id so rows that cannot be parsed are not fetched again
+            batch = db.query(Article.id, Article.published).filter(
+                Article.id > last_id,
+                Article.published_at == None,
+                Article.published != None,
+            ).order_by(Article.id).limit(BATCH_SIZE).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            values = []
+            for article_id, published in batch:
+                published_at = parse_published(published)
+                if published_at is None:
+                    unparsed += 1
+                else:
+                    values.append({"id": article_id, "published_at": published_at})
+
+            if values:
+                db.execute(update(Article), values)
+            db.commit()
+            updated += len(values)
+            print(f"Backfilled {updated} articles (up to id {last_id})...")
+
+        print(f"\n✅ Backfilled published_at for {updated} articles, {unparsed} dates could not be parsed")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    backfill_published_at()
@@ -0,0 +1,81 @@
+"""
+Benchmark offset vs cursor pagination of the article list on Postgres.
+Seeds synthetic articles (links prefixed 'bench://'), times the same page
+depths both ways and removes the rows again unless --keep is given.
+
+    python bench_pagination.py [rows] [--keep]
+"""
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text, tuple_
+from src.models import SessionLocal, Article, init_db
+
+PER_PAGE = 20
+DEPTHS = [1, 100, 1000, 10000, 50000]
+REPEAT = 5
+
+
+def seed(db, rows):
+    db.execute(text("""
+        INSERT INTO articles (title, link, fetched_at)
+        SELECT 'bench ' || n, 'bench://' || n, now() - n * interval '1 second'
+        FROM generate_series(1, :rows) AS n
+        ON CONFLICT (link) DO NOTHING
+    """), {"rows": rows})
+    db.commit()
+    db.execute(text("ANALYZE articles"))
+
+
+def newest_first(db):
+    return db.query(Article).order_by(Article.fetched_at.desc(), Article.id.desc())
+
+
+def time_query(build):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        build().limit(PER_PAGE).all()
+    return (time.perf_counter() - started) / REPEAT * 1000
+
+
+def cursor_before(db, page):
+    """(fetched_at, id) of the last row on the page before ``page``"""
+    return db.query(Article.fetched_at, Article.id).order_by(
+        Article.fetched_at.desc(), Article.id.desc()
+    ).offset((page - 1) * PER_PAGE - 1).limit(1).one()
+
+
+def run_benchmark(rows, keep):
+    init_db()
+    db = SessionLocal()
+    try:
+        print(f"Seeding {rows} articles...")
+        seed(db, rows)
+
+        print(f"{'page':>8}{'offset ms':>12}{'cursor ms':>12}")
+        for page in DEPTHS:
+            if page * PER_PAGE > rows:
+                break
+            offset_ms = time_query(lambda: newest_first(db).offset((page - 1) * PER_PAGE))
+            if page == 1:
+                cursor_ms = time_query(lambda: newest_first(db))
+            else:
+                last = cursor_before(db, page)
+                cursor_ms = time_query(lambda: newest_first(db).filter(
+                    tuple_(Article.fetched_at, Article.id) < tuple_(last.fetched_at, last.id)
+                ))
+            print(f"{page:>8}{offset_ms:>12.2f}{cursor_ms:>12.2f}")
+    finally:
+        if not keep:
+            db.execute(text("DELETE FROM articles WHERE link LIKE 'bench://%'"))
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--keep"]
+    run_benchmark(int(args[0]) if args else 1_000_000, "--keep" in sys.argv)
@@ -9,7 +9,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.models import SessionLocal, Article
-from src.classifier import classify_article
+from src.classifier import classify_batch
+
+# Articles encoded per model call and committed together
+BATCH_SIZE = 256
 
 def classify_existing_articles():
     db = SessionLocal()
@@ -21,18 +24,18 @@ def classify_existing_articles():
         
         print(f"Found {len(articles)} articles to classify")
         
-        for i, article in enumerate(articles, 1):
-            category = classify_article(
-                title=article.title,
-                summary=article.summary,
-                content=article.content
+        for start in range(0, len(articles), BATCH_SIZE):
+            batch = articles[start:start + BATCH_SIZE]
+            results = classify_batch(
+                {"title": a.title, "summary": a.summary, "content": a.content}
+                for a in batch
             )
             
-            article.category = category
+            for article, (category, _) in zip(batch, results):
+                article.category = category
             
-            if i % 10 == 0:
-                db.commit()
-                print(f"Classified {i}/{len(articles)} articles...")
+            db.commit()
+            print(f"Classified {start + len(batch)}/{len(articles)} articles...")
         
         db.commit()
         print(f"\n✅ Successfully classified {len(articles)} articles!")
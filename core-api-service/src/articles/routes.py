@@ -1,29 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session, joinedload, load_only
 from typing import List, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import text
+from sqlalchemy import text, tuple_
 from ..models.database import get_db
 from ..models import Article
 from ..auth.security import get_current_admin, get_current_user
-from ..models.models import User, SavedArticle, ReadingHistory
-from .schemas import ArticleResponse, SavedArticleResponse, ReadingHistoryResponse
+from ..models.models import User, RSSSource, SavedArticle, ReadingHistory
+from .schemas import ArticleListItem, ArticleResponse, SavedArticleResponse, ReadingHistoryResponse
+from .pagination import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/api/v1/articles", tags=["Articles"])
 
-@router.get("", response_model=List[ArticleResponse])
+def _parse_date_param(value: str, name: str) -> datetime:
+    """ISO date or datetime query parameter as a UTC datetime (UTC if no offset)"""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {name}, expected ISO format"
+        )
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+# Columns read for list responses; content stays on disk until the detail view
+LIST_COLUMNS = (
+    Article.id, Article.title, Article.link, Article.published, Article.summary,
+    Article.image_url, Article.category, Article.source_id, Article.fetched_at,
+    Article.published_at,
+)
+
+@router.get("", response_model=List[ArticleListItem])
 def list_articles(
+    response: Response,
     source_id: Optional[int] = Query(None, description="Filter by source ID"),
     ids: Optional[List[int]] = Query(None, description="Filter by article IDs"),
+    category: Optional[str] = Query(None, description="Filter by category"),
     date_from: Optional[str] = Query(None, description="Filter from date (ISO format)"),
     date_to: Optional[str] = Query(None, description="Filter to date (ISO format)"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor; replaces page"),
     db: Session = Depends(get_db)
 ):
-    """Get list of articles with pagination and filters (Public access)"""
-    query = db.query(Article)
+    """Get list of articles with pagination and filters (Public access)
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to get the
+    following page; cursor pages cost the same at any depth and do not shift
+    when new articles arrive. ``page`` still works for offset pagination.
+    """
+    query = db.query(Article).options(
+        load_only(*LIST_COLUMNS),
+        joinedload(Article.source).load_only(RSSSource.id, RSSSource.name, RSSSource.category)
+    )
     
     # Apply filters
     if source_id:
@@ -32,19 +64,32 @@ def list_articles(
     if ids:
         query = query.filter(Article.id.in_(ids))
     
-    # For date filtering, we'd need to parse and compare properly
-    # This is a simplified version
+    if category:
+        query = query.filter(Article.category == category)
+    
+    # Range scans on ix_articles_published_at; a bare date_to includes that whole day
     if date_from:
-        query = query.filter(Article.published >= date_from)
+        query = query.filter(Article.published_at >= _parse_date_param(date_from, "date_from"))
     if date_to:
-        query = query.filter(Article.published <= date_to)
+        if len(date_to) == 10:
+            end = _parse_date_param(date_to, "date_to") + timedelta(days=1)
+            query = query.filter(Article.published_at < end)
+        else:
+            query = query.filter(Article.published_at <= _parse_date_param(date_to, "date_to"))
     
-    # Order by fetched_at descending
-    query = query.order_by(Article.fetched_at.desc())
+    # Order by fetched_at descending (id breaks ties, matches ix_articles_fetched_at_id)
+    query = query.order_by(Article.fetched_at.desc(), Article.id.desc())
     
     # Apply pagination
-    offset = (page - 1) * per_page
-    articles = query.offset(offset).limit(per_page).all()
+    if cursor:
+        fetched_at, last_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Article.fetched_at, Article.id) < tuple_(fetched_at, last_id))
+    else:
+        query = query.offset((page - 1) * per_page)
+    articles = query.limit(per_page).all()
+    
+    if len(articles) == per_page and articles[-1].fetched_at is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(articles[-1].fetched_at, articles[-1].id)
     
     return articles
 
@@ -73,7 +118,9 @@ def get_reading_history(
 @router.get("/{article_id}", response_model=ArticleResponse)
 def get_article(article_id: int, db: Session = Depends(get_db)):
     """Get article details (Public access)"""
-    article = db.query(Article).filter(Article.id == article_id).first()
+    article = db.query(Article).options(
+        joinedload(Article.source)
+    ).filter(Article.id == article_id).first()
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
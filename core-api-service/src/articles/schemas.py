@@ -16,6 +16,24 @@ class ArticleResponse(BaseModel):
     link: str
     content: Optional[str]
     published: Optional[str]
+    published_at: Optional[datetime] = None
+    summary: Optional[str]
+    image_url: Optional[str]
+    category: Optional[str]
+    source_id: Optional[int]
+    source: Optional[RSSSourceBasic]
+    fetched_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class ArticleListItem(BaseModel):
+    """Article as shown in lists; the full content is only on GET /{article_id}"""
+    id: int
+    title: str
+    link: str
+    published: Optional[str]
+    published_at: Optional[datetime] = None
     summary: Optional[str]
     image_url: Optional[str]
     category: Optional[str]
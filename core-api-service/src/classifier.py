@@ -7,9 +7,9 @@ Now uses hybrid semantic + keyword approach:
 """
 
 import re
-from typing import Optional, Tuple
-import numpy as np
-from sentence_transformers import SentenceTransformer, util
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 
 
 # Category prototypes in Vietnamese (short descriptions)
@@ -46,22 +46,98 @@ CATEGORY_KEYWORDS = {
 }
 
 
-# Load model once (shared across worker)
-_MODEL = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
-_CATEGORY_EMB = {
-    cat: _MODEL.encode(desc, convert_to_tensor=True)
-    for cat, desc in CATEGORY_DESCRIPTIONS.items()
-}
+MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+# Model and prototypes are loaded on first use (or by warm_up), not at import,
+# so the API can serve requests while the model is still loading
+_MODEL = None
+_CATEGORY_NAMES = list(CATEGORY_DESCRIPTIONS)
+_PROTOTYPES = None
+_model_lock = threading.Lock()
+_model_state = {"status": "not_loaded", "error": None, "load_seconds": None}
+
+
+def _get_model():
+    """Load the shared model once; concurrent callers wait for the same load."""
+    global _MODEL, _PROTOTYPES
+    if _MODEL is not None:
+        return _MODEL, _PROTOTYPES
+    with _model_lock:
+        if _MODEL is None:
+            _model_state["status"] = "loading"
+            started = time.perf_counter()
+            try:
+                # Heavy import (torch) deferred together with the model itself
+                from sentence_transformers import SentenceTransformer
+
+                model = SentenceTransformer(MODEL_NAME)
+                # One row per category, L2-normalized so a dot product is the cosine similarity
+                _PROTOTYPES = model.encode(
+                    [CATEGORY_DESCRIPTIONS[cat] for cat in _CATEGORY_NAMES],
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                )
+                _MODEL = model
+            except Exception as e:
+                _model_state.update(status="failed", error=str(e))
+                raise
+            _model_state.update(
+                status="ready",
+                error=None,
+                load_seconds=round(time.perf_counter() - started, 2),
+            )
+    return _MODEL, _PROTOTYPES
+
+
+def warm_up():
+    """Load the model now (meant for a background thread at startup)."""
+    try:
+        _get_model()
+        print(f"Classifier model ready in {_model_state['load_seconds']}s")
+    except Exception as e:
+        print(f"Classifier model failed to load: {e}")
+
+
+def start_warm_up():
+    threading.Thread(target=warm_up, name="classifier-warm-up", daemon=True).start()
+
+
+def model_status() -> Dict:
+    return dict(_model_state)
+
+
+def is_ready() -> bool:
+    return _MODEL is not None
+
+# Semantic similarity below this falls back to keywords (tuneable)
+SEMANTIC_THRESHOLD = 0.28
+ENCODE_BATCH_SIZE = 64
+
+
+def _semantic_classify_batch(texts: Sequence[str]):
+    """Encode all texts in one call and score them against every prototype at once.
+
+    Returns ``[(category, score)]`` and the normalized embeddings, one row per text.
+    """
+    if not texts:
+        return [], []
+    model, prototypes = _get_model()
+    emb = model.encode(
+        list(texts),
+        batch_size=ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+    scores = emb @ prototypes.T
+    best = scores.argmax(axis=1)
+    return [
+        (_CATEGORY_NAMES[j], float(scores[i, j]))
+        for i, j in enumerate(best)
+    ], emb
 
 
 def _semantic_classify(text: str) -> Tuple[str, float]:
-    emb = _MODEL.encode(text, convert_to_tensor=True)
-    scores = {
-        cat: util.cos_sim(emb, proto_emb).item()
-        for cat, proto_emb in _CATEGORY_EMB.items()
-    }
-    best_cat = max(scores.items(), key=lambda x: x[1])
-    return best_cat[0], float(best_cat[1])
+    return _semantic_classify_batch([text])[0][0]
 
 
 def _keyword_classify(text: str) -> Tuple[str, int]:
@@ -77,13 +153,8 @@ def _keyword_classify(text: str) -> Tuple[str, int]:
     return best_cat[0], best_cat[1]
 
 
-def classify_article(title: str, summary: Optional[str] = None, content: Optional[str] = None) -> str:
-    """Hybrid semantic + keyword classification.
-
-    - Build a short text bundle from title + summary + content (first 800 chars)
-    - Semantic: sentence-transformers similarity to category prototypes
-    - If semantic confidence below threshold, fall back to keywords
-    """
+def _prepare_text(title: str, summary: Optional[str] = None, content: Optional[str] = None) -> str:
+    """Build a short text bundle from title + summary + content (first 800 chars)."""
     text_parts = [title or ""]
     if summary:
         text_parts.append(summary)
@@ -92,39 +163,46 @@ def classify_article(title: str, summary: Optional[str] = None, content: Optiona
 
     text_full = " ".join(text_parts).strip()
     text_clean = re.sub(r"[^\w\s]", " ", text_full.lower())
-    text_clean = re.sub(r"\s+", " ", text_clean)
+    return re.sub(r"\s+", " ", text_clean)
 
-    # Semantic step
-    semantic_cat, semantic_score = _semantic_classify(text_clean)
 
-    # Threshold: if similarity < 0.28, use keyword fallback (tuneable)
-    if semantic_score >= 0.28:
-        return semantic_cat
+def classify_batch(articles: Iterable[Dict], return_embeddings: bool = False):
+    """Classify many articles with one batched encode and one matrix multiply.
 
-    # Keyword fallback
-    kw_cat, kw_score = _keyword_classify(text_clean)
-    if kw_score > 0:
-        return kw_cat
+    ``articles`` are dicts with ``title`` and optional ``summary``/``content``.
+    Returns ``(category, confidence)`` per article, in input order:
+    - Semantic: sentence-transformers similarity to category prototypes
+    - If semantic confidence below threshold, fall back to keywords
 
-    return "Khác"
+    With ``return_embeddings`` the article embeddings (lists of floats, same
+    model as recommendation-service) are returned too, so they can be indexed
+    without a second forward pass: ``(results, embeddings)``.
+    """
+    texts = [
+        _prepare_text(a.get("title", ""), a.get("summary"), a.get("content"))
+        for a in articles
+    ]
+    semantic, embeddings = _semantic_classify_batch(texts)
+    results = []
+    for text, (semantic_cat, semantic_score) in zip(texts, semantic):
+        if semantic_score >= SEMANTIC_THRESHOLD:
+            results.append((semantic_cat, semantic_score))
+            continue
+
+        kw_cat, kw_score = _keyword_classify(text)
+        if kw_score > 0:
+            results.append((kw_cat, 0.2))  # low confidence but non-zero
+        else:
+            results.append(("Khác", 0.0))
+    if return_embeddings:
+        return results, [row.tolist() for row in embeddings]
+    return results
 
 
-def classify_with_confidence(title: str, summary: Optional[str] = None, content: Optional[str] = None) -> tuple[str, float]:
-    text_parts = [title or ""]
-    if summary:
-        text_parts.append(summary)
-    if content:
-        text_parts.append(content[:800])
-    text_full = " ".join(text_parts).strip()
-    text_clean = re.sub(r"[^\w\s]", " ", text_full.lower())
-    text_clean = re.sub(r"\s+", " ", text_clean)
-
-    semantic_cat, semantic_score = _semantic_classify(text_clean)
-    if semantic_score >= 0.28:
-        return semantic_cat, semantic_score
+def classify_article(title: str, summary: Optional[str] = None, content: Optional[str] = None) -> str:
+    """Hybrid semantic + keyword classification of a single article (see classify_batch)."""
+    return classify_with_confidence(title, summary, content)[0]
 
-    kw_cat, kw_score = _keyword_classify(text_clean)
-    if kw_score > 0:
-        return kw_cat, 0.2  # low confidence but non-zero
 
-    return "Khác", 0.0
+def classify_with_confidence(title: str, summary: Optional[str] = None, content: Optional[str] = None) -> tuple[str, float]:
+    return classify_batch([{"title": title, "summary": summary, "content": content}])[0]
@@ -63,7 +63,8 @@ def trigger_crawl(
         task_data = {
             "source_id": source.id,
             "url": source.url,
-            "name": source.name
+            "name": source.name,
+            "force": request.force
         }
         
         success = publish_crawl_task(task_data)
@@ -89,7 +90,8 @@ def trigger_crawl(
             task_data = {
                 "source_id": source.id,
                 "url": source.url,
-                "name": source.name
+                "name": source.name,
+                "force": request.force
             }
             if publish_crawl_task(task_data):
                 queued_count += 1
@@ -3,6 +3,7 @@ from typing import Optional
 
 class CrawlerTriggerRequest(BaseModel):
     source_id: Optional[int] = None  # If None, crawl all sources
+    force: bool = False  # Re-crawl every feed entry, even already ingested links
 
 class CrawlerScheduleUpdate(BaseModel):
     cron_schedule: str
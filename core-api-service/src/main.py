@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
 from dotenv import load_dotenv
 
@@ -13,7 +14,8 @@ from .sources.routes import router as sources_router
 from .articles.routes import router as articles_router
 from .crawler.routes import router as crawler_router
 from .admin.routes import router as admin_router
-from .worker import start_background_worker
+from .worker import start_background_worker, worker_metrics
+from .classifier import is_ready as classifier_ready, model_status, start_warm_up
 
 app = FastAPI(
     title="Core API Service",
@@ -28,12 +30,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Initialize database
 @app.on_event("startup")
 def startup_event():
     init_db()
+    # Model loads in the background; the consumer waits for it on first classification
+    start_warm_up()
     start_background_worker()
 
 # Include routers
@@ -58,6 +63,24 @@ def health():
         "service": "core-api"
     }
 
+@app.get("/metrics")
+def metrics():
+    """Ingest worker counters, per-stage timings (classify / db / enqueue) and indexer stats"""
+    return {
+        "service": "core-api",
+        "worker": worker_metrics
+    }
+
+@app.get("/ready")
+def ready():
+    """Readiness: 200 once the classifier model is loaded, 503 while it is loading"""
+    body = {
+        "ready": classifier_ready(),
+        "service": "core-api",
+        "classifier": model_status()
+    }
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8080)
@@ -1,4 +1,4 @@
 from .database import Base, engine, get_db, init_db, SessionLocal
-from .models import User, RSSSource, Article, CrawlerConfig
+from .models import User, RSSSource, Article, CrawlerConfig, IndexOutbox
 
-__all__ = ["Base", "engine", "get_db", "init_db", "SessionLocal", "User", "RSSSource", "Article", "CrawlerConfig"]
+__all__ = ["Base", "engine", "get_db", "init_db", "SessionLocal", "User", "RSSSource", "Article", "CrawlerConfig", "IndexOutbox"]
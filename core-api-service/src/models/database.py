@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -23,5 +23,21 @@ def get_db():
     finally:
         db.close()
 
+# create_all only creates missing tables; columns and indexes added to existing
+# tables later are applied here (every statement must be idempotent)
+SCHEMA_UPGRADES = [
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_fetched_at_id ON articles (fetched_at DESC, id DESC)",
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS published_at TIMESTAMPTZ",
+    "CREATE INDEX IF NOT EXISTS ix_articles_published_at ON articles (published_at)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_source_id_fetched_at ON articles (source_id, fetched_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_category_fetched_at ON articles (category, fetched_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_saved_articles_user_id_saved_at ON saved_articles (user_id, saved_at)",
+    "CREATE INDEX IF NOT EXISTS ix_reading_history_user_id_read_at ON reading_history (user_id, read_at DESC)",
+]
+
 def init_db():
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for statement in SCHEMA_UPGRADES:
+            conn.execute(text(statement))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -34,13 +34,23 @@ class Article(Base):
     link = Column(Text, unique=True, nullable=False)
     content = Column(Text)
     published = Column(String(100))
+    published_at = Column(DateTime(timezone=True), index=True)  # Parsed from published, used for date filters
     summary = Column(Text)
     image_url = Column(Text)
     category = Column(String(50))  # Auto-classified category
     source_id = Column(Integer, ForeignKey("rss_sources.id"))
     fetched_at = Column(DateTime(timezone=True), server_default=func.now())
+    content_hash = Column(String(64))  # Fingerprint of the last crawled message applied
     
     source = relationship("RSSSource", back_populates="articles")
+    
+    __table_args__ = (
+        # Newest-first listing and keyset cursors on (fetched_at, id)
+        Index('ix_articles_fetched_at_id', fetched_at.desc(), id.desc()),
+        # Same ordering within one source / one category
+        Index('ix_articles_source_id_fetched_at', source_id, fetched_at.desc(), id.desc()),
+        Index('ix_articles_category_fetched_at', category, fetched_at.desc(), id.desc()),
+    )
 
 class SavedArticle(Base):
     __tablename__ = "saved_articles"
@@ -52,6 +62,8 @@ class SavedArticle(Base):
     
     user = relationship("User")
     article = relationship("Article")
+    
+    __table_args__ = (Index('ix_saved_articles_user_id_saved_at', 'user_id', 'saved_at'),)
 
 class ReadingHistory(Base):
     __tablename__ = "reading_history"
@@ -64,7 +76,10 @@ class ReadingHistory(Base):
     user = relationship("User")
     article = relationship("Article")
     
-    __table_args__ = (UniqueConstraint('user_id', 'article_id', name='unique_user_article_read'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'article_id', name='unique_user_article_read'),
+        Index('ix_reading_history_user_id_read_at', user_id, read_at.desc()),
+    )
 
 class CrawlerConfig(Base):
     __tablename__ = "crawler_config"
@@ -73,3 +88,11 @@ class CrawlerConfig(Base):
     cron_schedule = Column(String(100), default="0 */6 * * *")  # Every 6 hours by default
     is_enabled = Column(Boolean, default=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class IndexOutbox(Base):
+    __tablename__ = "index_outbox"
+
+    # Index requests committed with their articles, deleted once on the broker
+    id = Column(Integer, primary_key=True)
+    payload = Column(Text, nullable=False)  # JSON body for the index_requests queue
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,12 +1,18 @@
 import pika
+import hashlib
 import json
 import os
 import threading
+import time
 import httpx
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from .models import SessionLocal, Article, RSSSource
-from .classifier import classify_article
+from .models import SessionLocal, Article, RSSSource, IndexOutbox
+from .classifier import MODEL_NAME, classify_batch
 
 RABBITMQ_HOST = os.getenv('RABBITMQ_HOST', 'rabbitmq')
 RABBITMQ_PORT = int(os.getenv('RABBITMQ_PORT', '5672'))
@@ -14,143 +20,517 @@ RABBITMQ_USER = os.getenv('RABBITMQ_USER', 'guest')
 RABBITMQ_PASSWORD = os.getenv('RABBITMQ_PASSWORD', 'guest')
 RECOMMENDATION_URL = os.getenv('RECOMMENDATION_URL', 'http://recommendation-service:8001')
 
-def save_article_to_db(article_data: dict, db: Session):
-    """Save or update article in database"""
+# crawled_data messages handled together: flush at N messages or after T ms
+WORKER_BATCH_SIZE = int(os.getenv('WORKER_BATCH_SIZE', '50'))
+WORKER_BATCH_MAX_WAIT_MS = int(os.getenv('WORKER_BATCH_MAX_WAIT_MS', '500'))
+
+# Vector indexing runs off its own durable queue so a slow recommendation-service
+# never holds up crawled_data acks
+INDEX_QUEUE = 'index_requests'
+INDEX_MAX_ATTEMPTS = int(os.getenv('INDEX_MAX_ATTEMPTS', '4'))
+INDEX_RETRY_BACKOFF_SECONDS = float(os.getenv('INDEX_RETRY_BACKOFF_SECONDS', '1.0'))
+# A batch that fails all its attempts goes to the back of the queue this many
+# times (counted in a message header), then is parked on the dead-letter queue
+INDEX_MAX_ROUNDS = int(os.getenv('INDEX_MAX_ROUNDS', '5'))
+INDEX_DEAD_LETTER_QUEUE = 'index_requests_failed'
+INDEX_ROUNDS_HEADER = 'x-index-rounds'
+
+STAGES = ("classify", "db", "enqueue")
+worker_metrics = {
+    "batches": 0,
+    "messages": 0,
+    "failed": 0,
+    "changed": 0,
+    "unchanged_skipped": 0,
+    "stage_seconds": {stage: 0.0 for stage in STAGES},
+    "last_batch": None,
+    "indexer": {
+        "requests": 0,
+        "indexed": 0,
+        "unchanged": 0,
+        "retries": 0,
+        "requeued": 0,
+        "dead_lettered": 0,
+        "last_latency_ms": None,
+    },
+}
+
+# Message fields that end up in the articles row; the fingerprint covers all of them
+FINGERPRINT_FIELDS = ('title', 'link', 'content', 'summary', 'published', 'image_url', 'source_id')
+
+def article_fingerprint(article_data: dict) -> str:
+    """sha256 of the crawled fields; equal fingerprints mean nothing to update"""
+    fields = {field: article_data.get(field) for field in FINGERPRINT_FIELDS}
+    return hashlib.sha256(
+        json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    ).hexdigest()
+
+def find_unchanged(items, db: Session):
+    """Indexes of (article_data, fingerprint) items whose row already has that fingerprint"""
+    links = {data.get('link') for data, _ in items}
+    stored = dict(
+        db.query(Article.link, Article.content_hash).filter(Article.link.in_(links))
+    )
+    return {
+        i for i, (data, fingerprint) in enumerate(items)
+        if stored.get(data.get('link')) == fingerprint
+    }
+
+def parse_published(value):
+    """Timezone-aware datetime from an RSS (RFC 822) or ISO 8601 date, or None.
+
+    Dates without an offset are taken as UTC.
+    """
+    if not value or not str(value).strip():
+        return None
+    value = str(value).strip()
     try:
-        # Check if article already exists
-        existing = db.query(Article).filter(Article.link == article_data.get('link')).first()
-        
-        # Auto-classify article
-        category = classify_article(
-            title=article_data.get('title', ''),
-            summary=article_data.get('summary'),
-            content=article_data.get('content')
-        )
-        
-        if existing:
-            # Update existing article
-            existing.title = article_data.get('title')
-            # IMPORTANT: Only update content if new content is provided and not empty
-            new_content = article_data.get('content')
-            if new_content and len(str(new_content).strip()) > 0:
-                existing.content = new_content
-            # If new_content is empty/None, keep existing content (don't overwrite with summary)
-            existing.published = article_data.get('published')
-            existing.summary = article_data.get('summary')
-            existing.image_url = article_data.get('image_url')
-            existing.category = category
-            if article_data.get('source_id'):
-                existing.source_id = article_data.get('source_id')
-            
-            db.commit()
-            db.refresh(existing)
-            
-            print(f"Updated article: {existing.title} (Category: {category})")
-            return existing
-        
-        # Create new article
-        new_content = article_data.get('content')
-        # If no detailed content, fall back to summary
-        if not new_content or len(str(new_content).strip()) == 0:
-            new_content = article_data.get('summary')
-        
-        new_article = Article(
-            title=article_data.get('title'),
-            link=article_data.get('link'),
-            content=new_content,
-            published=article_data.get('published'),
-            summary=article_data.get('summary'),
-            image_url=article_data.get('image_url'),
-            category=category,
-            source_id=article_data.get('source_id')
-        )
-        
-        db.add(new_article)
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def _has_text(value) -> bool:
+    return bool(value) and len(str(value).strip()) > 0
+
+def _merge_duplicate_links(items):
+    """Collapse repeated links in a batch (ON CONFLICT may touch a row only once).
+
+    Later messages win, except that an empty content never replaces a
+    non-empty one, like applying the messages one after another.
+    """
+    merged = {}
+    for article_data, category in items:
+        link = article_data.get('link')
+        previous = merged.get(link)
+        row = {**article_data, 'category': category, 'content_hash': article_fingerprint(article_data)}
+        if previous is not None:
+            if not _has_text(row.get('content')) and _has_text(previous.get('content')):
+                row['content'] = previous['content']
+            if not row.get('source_id'):
+                row['source_id'] = previous.get('source_id')
+        merged[link] = row
+    return list(merged.values())
+
+def _upsert_statement(rows, update_content: bool):
+    stmt = pg_insert(Article).values([
+        {
+            'title': row.get('title'),
+            'link': row.get('link'),
+            # If no detailed content, fall back to summary (new rows only)
+            'content': row.get('content') if _has_text(row.get('content')) else row.get('summary'),
+            'published': row.get('published'),
+            'published_at': parse_published(row.get('published')),
+            'summary': row.get('summary'),
+            'image_url': row.get('image_url'),
+            'category': row.get('category'),
+            'source_id': row.get('source_id') or None,
+            'content_hash': row.get('content_hash'),
+        }
+        for row in rows
+    ])
+    excluded = stmt.excluded
+    update = {
+        'title': excluded.title,
+        'published': excluded.published,
+        'published_at': excluded.published_at,
+        'summary': excluded.summary,
+        'image_url': excluded.image_url,
+        'category': excluded.category,
+        'source_id': func.coalesce(excluded.source_id, Article.source_id),
+        'content_hash': excluded.content_hash,
+    }
+    # IMPORTANT: existing content is only replaced by new non-empty content
+    if update_content:
+        update['content'] = excluded.content
+    return stmt.on_conflict_do_update(index_elements=[Article.link], set_=update).returning(
+        Article.id, Article.link, Article.title, Article.content, Article.summary, Article.content_hash
+    )
+
+class IndexEnqueueError(Exception):
+    """Publishing to INDEX_QUEUE failed; the requests stay in index_outbox"""
+
+def save_articles_to_db(items, db: Session, before_commit=None):
+    """Upsert a batch of (article_data, category) keyed on link, in one transaction.
+
+    At most two INSERT ... ON CONFLICT (link) DO UPDATE statements: rows with
+    new content, and rows without (which keep any existing content). Returns
+    dicts with the fields the indexer needs, one per item (repeated links share
+    a row). ``before_commit(rows)`` runs inside the transaction, so writes it
+    makes (the index_outbox row) commit or roll back with the articles.
+    Raises on failure (rolled back).
+    """
+    rows = _merge_duplicate_links(items)
+    with_content = [row for row in rows if _has_text(row.get('content'))]
+    without_content = [row for row in rows if not _has_text(row.get('content'))]
+
+    saved = {}
+    try:
+        for group, update_content in ((with_content, True), (without_content, False)):
+            if group:
+                for result in db.execute(_upsert_statement(group, update_content)):
+                    saved[result.link] = {
+                        "id": result.id, "title": result.title,
+                        "content": result.content, "summary": result.summary,
+                        "content_hash": result.content_hash
+                    }
+        rows = [saved[article_data.get('link')] for article_data, _ in items]
+        if before_commit is not None:
+            before_commit(rows)
         db.commit()
-        db.refresh(new_article)
+    except Exception:
+        db.rollback()
+        raise
+    return rows
+
+def save_article_to_db(article_data: dict, db: Session, category: str = None, before_commit=None):
+    """Save or update article in database (category is computed if not given)"""
+    try:
+        # Auto-classify article
+        if category is None:
+            category = classify_batch([article_data])[0][0]
         
-        print(f"Saved new article: {new_article.title} (Category: {category})")
-        return new_article
+        [saved] = save_articles_to_db([(article_data, category)], db, before_commit)
+        print(f"Saved article: {saved['title']} (Category: {category})")
+        return saved
     except Exception as e:
-        db.rollback()
         print(f"Error saving article: {e}")
         return None
 
-def index_article_in_recommendation_service(article):
-    """Send article to recommendation service for vector indexing"""
-    try:
-        data = {
-            "id": article.id,
-            "title": article.title,
-            "content": article.content or article.summary or article.title
+def stage_index_request(db: Session, rows, vectors):
+    """Add the index request for a saved batch to index_outbox (not committed here).
+
+    Called inside the article transaction, so a request exists exactly when
+    its articles were committed; publish_index_outbox sends it afterwards.
+    """
+    # A link repeated in the batch is one row; index it once, with its latest data
+    latest = {row["id"]: (row, vector) for row, vector in zip(rows, vectors)}
+    articles = [
+        {
+            "id": row["id"],
+            "title": row["title"],
+            "content": row["content"] or row["summary"] or row["title"],
+            "vector": vector,
+            "model": MODEL_NAME,
+            "content_hash": row["content_hash"]
         }
-        
-        response = httpx.post(
-            f"{RECOMMENDATION_URL}/api/v1/vectors/upsert",
-            json=data,
-            timeout=10.0
-        )
-        
-        if response.status_code == 200:
-            print(f"Indexed article in recommendation service: {article.title}")
-        else:
-            print(f"Failed to index article: {response.status_code}")
-    except Exception as e:
-        print(f"Error indexing article in recommendation service: {e}")
+        for row, vector in latest.values()
+    ]
+    db.add(IndexOutbox(payload=json.dumps({"articles": articles})))
 
-def process_crawled_article(ch, method, properties, body):
-    """Process crawled articles from RabbitMQ"""
+def publish_index_outbox(channel):
+    """Publish committed index requests to INDEX_QUEUE, oldest first, then delete them.
+
+    ``channel`` is in confirm mode, so rows are deleted only once the broker
+    has their messages; a failure or crash in between publishes some again,
+    which the idempotent indexer absorbs. Raises IndexEnqueueError, leaving
+    the rows for the next call.
+    """
     db = SessionLocal()
     try:
-        article_data = json.loads(body)
-        print(f"Processing crawled article: {article_data.get('title', 'Unknown')}")
-        
-        # Save to database
-        article = save_article_to_db(article_data, db)
-        
-        # If saved successfully, index in recommendation service
-        if article:
-            index_article_in_recommendation_service(article)
-        
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-    except Exception as e:
-        print(f"Error processing crawled article: {e}")
-        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        # SKIP LOCKED: another worker replica flushing at the same time takes other rows
+        pending = db.query(IndexOutbox).order_by(IndexOutbox.id).with_for_update(skip_locked=True).all()
+        for entry in pending:
+            try:
+                channel.basic_publish(
+                    exchange='',
+                    routing_key=INDEX_QUEUE,
+                    body=entry.payload,
+                    properties=pika.BasicProperties(delivery_mode=2),
+                    mandatory=True
+                )
+            except Exception as e:
+                raise IndexEnqueueError(f"could not queue index request {entry.id}: {e}") from e
+        for entry in pending:
+            db.delete(entry)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+class RetryableIndexError(Exception):
+    pass
+
+class RejectedIndexError(Exception):
+    """The recommendation service refused the batch; resending it will not help"""
+
+def index_articles_in_recommendation_service(client: httpx.Client, request: dict):
+    """One call to the recommendation service batch endpoint.
+
+    Raises RetryableIndexError for failures worth retrying (including a
+    response body it cannot read) and RejectedIndexError for other 4xx.
+    """
+    try:
+        response = client.post("/api/v1/vectors/upsert/batch", json=request)
+    except httpx.HTTPError as e:
+        raise RetryableIndexError(f"transport error: {e}") from e
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableIndexError(f"status {response.status_code}")
+    if response.status_code != 200:
+        # Client errors (a 404 mid-deploy, a 422 on a schema mismatch) will not succeed on retry
+        raise RejectedIndexError(f"status {response.status_code}: {response.text[:200]}")
+    try:
+        result = response.json()
+        errors = [item for item in result["results"] if item["status"] == "error"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise RetryableIndexError(f"malformed response: {e!r}") from e
+    if errors:
+        # Upserts are idempotent and unchanged points are skipped, so resend the batch
+        raise RetryableIndexError(f"{len(errors)} articles failed: {errors[0].get('message')}")
+    return result
+
+def _republish_index_request(channel, queue, body, rounds):
+    channel.basic_publish(
+        exchange='',
+        routing_key=queue,
+        body=body,
+        properties=pika.BasicProperties(delivery_mode=2, headers={INDEX_ROUNDS_HEADER: rounds}),
+        mandatory=True
+    )
+
+def process_index_request(client: httpx.Client, channel, method, properties, body):
+    """Index one queued batch with retries and exponential backoff, then ack it.
+
+    While the recommendation service is failing this thread sleeps between
+    attempts; with prefetch 1 the backlog waits in RabbitMQ, not in memory.
+    A batch that exhausts its attempts is republished to the back of the queue
+    so it does not block the batches behind it, and after INDEX_MAX_ROUNDS
+    rounds it is moved to INDEX_DEAD_LETTER_QUEUE. A batch the service rejects
+    goes straight to INDEX_DEAD_LETTER_QUEUE.
+    """
+    stats = worker_metrics["indexer"]
+    try:
+        request = json.loads(body)
+    except ValueError as e:
+        print(f"Dropping unreadable index request: {e}")
+        channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        return
+    rounds = int(((properties.headers if properties else None) or {}).get(INDEX_ROUNDS_HEADER, 0)) + 1
+    for attempt in range(1, INDEX_MAX_ATTEMPTS + 1):
+        started = time.perf_counter()
+        try:
+            result = index_articles_in_recommendation_service(client, request)
+        except RetryableIndexError as e:
+            print(f"Indexing batch failed (attempt {attempt}/{INDEX_MAX_ATTEMPTS}): {e}")
+            if attempt < INDEX_MAX_ATTEMPTS:
+                stats["retries"] += 1
+                time.sleep(INDEX_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            continue
+        except RejectedIndexError as e:
+            print(f"Recommendation service rejected batch of {len(request['articles'])} ({e}), "
+                  f"moving it to {INDEX_DEAD_LETTER_QUEUE}")
+            stats["dead_lettered"] += 1
+            _republish_index_request(channel, INDEX_DEAD_LETTER_QUEUE, body, rounds)
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            return
+        stats["requests"] += 1
+        stats["last_latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        stats["indexed"] += result.get("indexed", 0)
+        stats["unchanged"] += result.get("unchanged", 0)
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+        return
+    if rounds < INDEX_MAX_ROUNDS:
+        # Keep the batch, behind the ones queued after it
+        stats["requeued"] += 1
+        _republish_index_request(channel, INDEX_QUEUE, body, rounds)
+    else:
+        print(f"Giving up on batch of {len(request['articles'])} after {rounds} rounds, "
+              f"moving it to {INDEX_DEAD_LETTER_QUEUE}")
+        stats["dead_lettered"] += 1
+        _republish_index_request(channel, INDEX_DEAD_LETTER_QUEUE, body, rounds)
+    # Confirm mode: the copy is on the broker before the original is acked
+    channel.basic_ack(delivery_tag=method.delivery_tag)
+
+def process_crawled_batch(channel, deliveries):
+    """Classify, save and index a batch of crawled_data messages, then ack it.
+
+    Messages whose fingerprint matches the stored article are acked without
+    classification, writes or indexing. ``deliveries`` is a list of
+    (method, body). Unreadable messages are
+    nacked on their own; if the batch transaction fails, messages are saved
+    one by one so a single bad article does not take the batch down.
+
+    The index request is written to index_outbox in the articles'
+    transaction and published (and confirmed) after the commit, so only
+    committed articles are ever indexed. If publishing fails nothing is acked
+    and IndexEnqueueError propagates; the consumer reconnects, publishes the
+    outbox on startup and the redelivered messages are skipped as unchanged.
+    """
+    timings = {stage: 0.0 for stage in STAGES}
+    items = []
+    for method, body in deliveries:
+        try:
+            items.append((method, json.loads(body)))
+        except ValueError as e:
+            print(f"Dropping unreadable crawled article: {e}")
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+
+    saved_rows, failed, unchanged = [], [], []
+    db = SessionLocal()
+    try:
+        if items:
+            # Re-crawled articles identical to what is stored skip every later stage
+            started = time.perf_counter()
+            fingerprints = [(data, article_fingerprint(data)) for _, data in items]
+            skip = find_unchanged(fingerprints, db)
+            unchanged = [items[i] for i in sorted(skip)]
+            items = [item for i, item in enumerate(items) if i not in skip]
+            timings["db"] += time.perf_counter() - started
+
+        if items:
+            started = time.perf_counter()
+            # One forward pass per batch; the same embeddings are queued for indexing
+            results, vectors = classify_batch(
+                [data for _, data in items], return_embeddings=True
+            )
+            timings["classify"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            try:
+                saved_rows = save_articles_to_db(
+                    [(data, category) for (_, data), (category, _) in zip(items, results)], db,
+                    before_commit=lambda rows: stage_index_request(db, rows, vectors)
+                )
+            except Exception as e:
+                print(f"Batch save of {len(items)} articles failed, saving one by one: {e}")
+                for (method, data), (category, _), vector in zip(items, results, vectors):
+                    row = save_article_to_db(
+                        data, db, category=category,
+                        before_commit=lambda rows, vector=vector: stage_index_request(db, rows, [vector])
+                    )
+                    if row is None:
+                        failed.append(method)
+                        continue
+                    saved_rows.append(row)
+            timings["db"] += time.perf_counter() - started
     finally:
         db.close()
 
+    if saved_rows:
+        started = time.perf_counter()
+        publish_index_outbox(channel)
+        timings["enqueue"] = time.perf_counter() - started
+
+    failed_tags = {m.delivery_tag for m in failed}
+    for method in failed:
+        channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+    for method, _ in items + unchanged:
+        if method.delivery_tag not in failed_tags:
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+
+    worker_metrics["batches"] += 1
+    worker_metrics["messages"] += len(deliveries)
+    worker_metrics["changed"] += len(saved_rows)
+    worker_metrics["unchanged_skipped"] += len(unchanged)
+    worker_metrics["failed"] += len(deliveries) - len(saved_rows) - len(unchanged)
+    for stage, seconds in timings.items():
+        worker_metrics["stage_seconds"][stage] += seconds
+    worker_metrics["last_batch"] = {
+        "size": len(deliveries),
+        "saved": len(saved_rows),
+        "unchanged": len(unchanged),
+        **{f"{stage}_ms": round(seconds * 1000, 1) for stage, seconds in timings.items()}
+    }
+    print(f"Processed batch of {len(deliveries)} crawled articles: {worker_metrics['last_batch']}")
+
+def _connection_parameters():
+    credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
+    return pika.ConnectionParameters(
+        host=RABBITMQ_HOST,
+        port=RABBITMQ_PORT,
+        credentials=credentials,
+        heartbeat=600,
+        blocked_connection_timeout=300
+    )
+
+def micro_batches(events, batch_size, max_wait, clock=time.monotonic):
+    """Group channel.consume events into lists of (method, body) deliveries.
+
+    A batch is yielded once it holds ``batch_size`` messages or ``max_wait``
+    seconds after its first message, checked on every event; idle events
+    (method None, from inactivity_timeout) only serve to check the deadline.
+    """
+    batch, deadline = [], None
+    for method, _, body in events:
+        if method is not None:
+            if not batch:
+                deadline = clock() + max_wait
+            batch.append((method, body))
+        if batch and (len(batch) >= batch_size or clock() >= deadline):
+            yield batch
+            batch, deadline = [], None
+
 def start_consumer():
     """Start RabbitMQ consumer for crawled data"""
+    connection = None
     try:
-        credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
-        connection = pika.BlockingConnection(
-            pika.ConnectionParameters(
-                host=RABBITMQ_HOST,
-                port=RABBITMQ_PORT,
-                credentials=credentials,
-                heartbeat=600,
-                blocked_connection_timeout=300
-            )
-        )
+        connection = pika.BlockingConnection(_connection_parameters())
         channel = connection.channel()
         channel.queue_declare(queue='crawled_data', durable=True)
-        channel.basic_qos(prefetch_count=1)
-        channel.basic_consume(
-            queue='crawled_data',
-            on_message_callback=process_crawled_article
-        )
+        channel.queue_declare(queue=INDEX_QUEUE, durable=True)
+        # Outbox rows are deleted only once the broker has confirmed their messages
+        channel.confirm_delivery()
+        # Requests left by a publish that failed before the last restart
+        publish_index_outbox(channel)
+        # Enough unacked messages in flight to fill a batch
+        channel.basic_qos(prefetch_count=WORKER_BATCH_SIZE)
         
         print("Started RabbitMQ consumer for crawled articles...")
-        channel.start_consuming()
+        max_wait = WORKER_BATCH_MAX_WAIT_MS / 1000
+        # inactivity_timeout yields (None, None, None) when idle so the deadline is checked
+        events = channel.consume(queue='crawled_data', inactivity_timeout=min(max_wait, 0.1) or 0.1)
+        for batch in micro_batches(events, WORKER_BATCH_SIZE, max_wait):
+            process_crawled_batch(channel, batch)
     except Exception as e:
         print(f"RabbitMQ consumer error: {e}")
+        # Closing returns the unacked batch to crawled_data for redelivery
+        if connection is not None and connection.is_open:
+            try:
+                connection.close()
+            except Exception:
+                pass
         # Retry connection after delay
-        import time
         time.sleep(5)
         start_consumer()
 
+def start_indexer():
+    """Consume index_requests with one pooled HTTP client (keep-alive across batches)"""
+    connection = None
+    try:
+        connection = pika.BlockingConnection(_connection_parameters())
+        channel = connection.channel()
+        channel.queue_declare(queue=INDEX_QUEUE, durable=True)
+        channel.queue_declare(queue=INDEX_DEAD_LETTER_QUEUE, durable=True)
+        # Requeued and dead-lettered copies must be stored before the original is acked
+        channel.confirm_delivery()
+        # One batch at a time: unindexed batches stay in RabbitMQ while the service is slow
+        channel.basic_qos(prefetch_count=1)
+        limits = httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        with httpx.Client(base_url=RECOMMENDATION_URL, timeout=30.0, limits=limits) as client:
+            print("Started indexer for recommendation service...")
+            for method, properties, body in channel.consume(queue=INDEX_QUEUE):
+                process_index_request(client, channel, method, properties, body)
+    except Exception as e:
+        print(f"Indexer error: {e}")
+        if connection is not None and connection.is_open:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        time.sleep(5)
+        start_indexer()
+
 def start_background_worker():
-    """Start background worker thread"""
+    """Start background worker threads (ingest consumer and indexer)"""
     consumer_thread = threading.Thread(target=start_consumer, daemon=True)
     consumer_thread.start()
+    indexer_thread = threading.Thread(target=start_indexer, daemon=True)
+    indexer_thread.start()
     print("Background worker started")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the article list endpoint: cursor pagination and date filters
+(in-memory SQLite, same harness as the query-count tests).
+"""
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from test_query_counts import PUBLISHED_START, TestingSession, client, seed
+from src.models import Article
+
+
+def list_ids(**params):
+    response = client.get('/api/v1/articles', params=params)
+    assert response.status_code == 200, response.text
+    return [a['id'] for a in response.json()], response.headers.get('x-next-cursor')
+
+
+def test_cursor_pages_match_offset_pages():
+    """Test walking X-Next-Cursor visits every article once, in offset order"""
+    print("Testing cursor pagination...")
+
+    seed()
+    # Groups of three articles share a fetched_at, so the id tie-breaker matters
+    db = TestingSession()
+    for i in range(1, 61):
+        db.execute(update(Article).where(Article.id == i).values(
+            fetched_at=datetime(2025, 1, 1) + timedelta(minutes=i // 3)
+        ))
+    db.commit()
+    db.close()
+
+    offset_ids = []
+    for page in range(1, 10):
+        ids, _ = list_ids(page=page, per_page=7)
+        offset_ids += ids
+
+    cursor_ids, cursor, pages = [], None, 0
+    while True:
+        ids, cursor = list_ids(per_page=7, **({'cursor': cursor} if cursor else {}))
+        cursor_ids += ids
+        pages += 1
+        if not cursor:
+            break
+
+    assert len(offset_ids) == 60
+    assert cursor_ids == offset_ids
+    assert pages == 9
+
+    print("✓ cursor pagination test passed")
+    return True
+
+
+def test_invalid_cursor_is_rejected():
+    """Test a cursor that does not decode is a 400, not a 500"""
+    for cursor in ('garbage', 'eyJmIjoxfQ', ''):
+        response = client.get('/api/v1/articles', params={'cursor': cursor})
+        expected = 200 if cursor == '' else 400
+        assert response.status_code == expected, (cursor, response.status_code)
+    return True
+
+
+def published_ids(lower=None, upper=None):
+    """Seeded ids (newest first) published in [lower, upper], both UTC"""
+    ids = []
+    for i in range(60, 0, -1):
+        published_at = PUBLISHED_START + timedelta(hours=6 * i)
+        if (lower is None or published_at >= lower) and (upper is None or published_at <= upper):
+            ids.append(i)
+    return ids
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_date_filters_use_published_at():
+    """Test date_from/date_to compare real timestamps, a bare date_to covering its whole day"""
+    print("Testing date filters...")
+
+    seed()
+    ids, _ = list_ids(per_page=100, date_from='2024-03-05')
+    assert ids == published_ids(lower=utc(2024, 3, 5))
+
+    # The article published at 23:00 UTC on the 5th is still inside date_to=2024-03-05
+    ids, _ = list_ids(per_page=100, date_to='2024-03-05')
+    assert ids == published_ids(upper=utc(2024, 3, 5, 23, 59, 59))
+    assert published_ids(lower=utc(2024, 3, 5, 23), upper=utc(2024, 3, 5, 23))[0] in ids
+
+    ids, _ = list_ids(per_page=100, date_from='2024-03-05', date_to='2024-03-05')
+    assert len(ids) == 4
+
+    # Full timestamps are inclusive and honour their offset
+    ids, _ = list_ids(per_page=100, date_from='2024-03-05T06:00:00+07:00', date_to='2024-03-05T11:00:00Z')
+    assert ids == published_ids(lower=utc(2024, 3, 4, 23), upper=utc(2024, 3, 5, 11))
+    assert len(ids) == 3
+
+    print("✓ date filters test passed")
+    return True
+
+
+def test_malformed_date_is_rejected():
+    """Test a date that is not ISO 8601 is a 400 instead of a text comparison"""
+    for params in ({'date_from': '05/03/2024'}, {'date_to': 'hôm qua'}):
+        response = client.get('/api/v1/articles', params=params)
+        assert response.status_code == 400, (params, response.status_code)
+        assert 'expected ISO format' in response.json()['detail']
+    return True
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Article List Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_cursor_pages_match_offset_pages,
+        test_invalid_cursor_is_rejected,
+        test_date_filters_use_published_at,
+        test_malformed_date_is_rejected,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
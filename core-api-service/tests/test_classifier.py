@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the article classifier with a stub embedding model (no
+sentence-transformers download needed). The batched matrix multiply must pick
+the same categories as scoring each article against each prototype with
+cosine similarity, one article at a time.
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+from src import classifier
+
+DIMENSIONS = 8
+rng = np.random.RandomState(13)
+
+# Prototypes live in the first dimensions; the last one is "off topic"
+PROTOTYPE_VECTORS = {
+    description: np.concatenate([rng.normal(size=DIMENSIONS - 1), [0.0]])
+    for description in classifier.CATEGORY_DESCRIPTIONS.values()
+}
+
+
+class StubModel:
+    """Returns a fixed, deliberately unnormalized vector per text"""
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=False):
+        self.calls.append(list(texts))
+        emb = np.array([self.vectors[text] for text in texts], dtype=np.float32)
+        if normalize_embeddings:
+            emb = emb / np.linalg.norm(emb, axis=1, keepdims=True)
+        return emb
+
+
+def cos_sim(a, b):
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def classify_one_by_one(text, vectors):
+    """The per-article loop classify_batch replaced"""
+    prototypes = {
+        cat: PROTOTYPE_VECTORS[desc] for cat, desc in classifier.CATEGORY_DESCRIPTIONS.items()
+    }
+    scores = {cat: cos_sim(vectors[text], proto) for cat, proto in prototypes.items()}
+    semantic_cat, semantic_score = max(scores.items(), key=lambda x: x[1])
+    if semantic_score >= 0.28:
+        return semantic_cat, semantic_score
+    kw_cat, kw_score = classifier._keyword_classify(text)
+    if kw_score > 0:
+        return kw_cat, 0.2
+    return "Khác", 0.0
+
+
+def install_stub(articles, article_vectors):
+    """Point the classifier at a StubModel knowing the prototypes and ``articles``"""
+    vectors = dict(PROTOTYPE_VECTORS)
+    for article, vector in zip(articles, article_vectors):
+        text = classifier._prepare_text(article['title'], article.get('summary'), article.get('content'))
+        vectors[text] = np.asarray(vector, dtype=np.float64)
+    model = StubModel(vectors)
+    classifier._MODEL = model
+    classifier._PROTOTYPES = model.encode(
+        [classifier.CATEGORY_DESCRIPTIONS[cat] for cat in classifier._CATEGORY_NAMES],
+        normalize_embeddings=True,
+    )
+    model.calls.clear()
+    return model, vectors
+
+
+def branch_articles():
+    """One article per branch: semantic match, keyword fallback, default"""
+    sport = PROTOTYPE_VECTORS[classifier.CATEGORY_DESCRIPTIONS['Thể thao']]
+    off_topic = np.eye(DIMENSIONS)[-1] * 3.0
+    articles = [
+        {'title': 'Đội tuyển thắng trận', 'summary': 'tin nhanh'},
+        {'title': 'Phiên giao dịch', 'summary': 'Chứng khoán giảm, cổ phiếu ngân hàng dẫn dắt'},
+        {'title': 'Thời tiết', 'content': '<p>Trời nắng nhẹ</p>'},
+    ]
+    return articles, [sport * 2.5 + off_topic * 0.1, off_topic + sport * 0.05, off_topic]
+
+
+def test_branches():
+    """Test the semantic, keyword and default branches"""
+    print("Testing classifier branches...")
+
+    articles, vectors = branch_articles()
+    install_stub(articles, vectors)
+    results = classifier.classify_batch(articles)
+
+    assert results[0][0] == 'Thể thao' and results[0][1] > 0.9
+    assert results[1] == ('Kinh doanh', 0.2)
+    assert results[2] == ('Khác', 0.0)
+
+    print("✓ classifier branches test passed")
+    return True
+
+
+def test_batch_matches_per_article_loop():
+    """Test one batched encode gives the per-article categories, in input order"""
+    print("Testing batch vs per-article parity...")
+
+    articles, vectors = branch_articles()
+    for i in range(40):
+        keyword = list(classifier.CATEGORY_KEYWORDS.values())[i % 5][i % 7]
+        articles.append({'title': f'Bài số {i}', 'summary': keyword if i % 3 else None})
+        vectors.append(rng.normal(size=DIMENSIONS) * rng.uniform(0.1, 5.0))
+    model, texts = install_stub(articles, vectors)
+
+    results, embeddings = classifier.classify_batch(articles, return_embeddings=True)
+    assert len(model.calls) == 1 and len(model.calls[0]) == len(articles)
+
+    expected = [
+        classify_one_by_one(
+            classifier._prepare_text(a['title'], a.get('summary'), a.get('content')), texts
+        )
+        for a in articles
+    ]
+    assert [cat for cat, _ in results] == [cat for cat, _ in expected]
+    for (_, score), (_, expected_score) in zip(results, expected):
+        assert abs(score - expected_score) < 1e-5
+    # Every branch is exercised, not just the semantic one
+    assert {cat for cat, score in results if score == 0.2} and ('Khác', 0.0) in results
+
+    # Embeddings come back in input order, normalized, as plain lists
+    assert len(embeddings) == len(articles)
+    for embedding, vector in zip(embeddings, vectors):
+        assert isinstance(embedding, list)
+        assert np.allclose(embedding, vector / np.linalg.norm(vector), atol=1e-6)
+    assert classifier.classify_batch(articles) == results
+
+    print("✓ batch vs per-article parity test passed")
+    return True
+
+
+def test_empty_batch():
+    """Test an empty batch needs no model"""
+    classifier._MODEL = None
+    assert classifier.classify_batch([]) == []
+    assert classifier.classify_batch([], return_embeddings=True) == ([], [])
+    return True
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Classifier Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_branches,
+        test_batch_matches_per_article_loop,
+        test_empty_batch,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Query-count tests for the article endpoints (in-memory SQLite, no Postgres needed).
+Each endpoint must issue the same number of statements whatever the page size,
+so a relationship that falls back to lazy loading per row shows up as a failure.
+"""
+import sys
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.models import Base, get_db, Article, RSSSource
+from src.models.models import User, SavedArticle, ReadingHistory
+from src.articles.routes import router as articles_router
+
+engine = create_engine(
+    'sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool
+)
+TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = TestingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app = FastAPI()
+app.include_router(articles_router)
+app.dependency_overrides[get_db] = override_get_db
+client = TestClient(app)
+
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement executed on the test engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def statement_count(path, **params):
+    with count_queries() as statements:
+        response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return len(statements), response.json()
+
+
+def assert_constant_queries(path, small, large, **params):
+    """Fail if fetching ``large`` rows takes more statements than fetching ``small``"""
+    small_count, small_rows = statement_count(path, per_page=small, **params)
+    large_count, large_rows = statement_count(path, per_page=large, **params)
+    assert len(large_rows) > len(small_rows), 'seed more rows than the small page'
+    assert small_count == large_count, (
+        f'{path}: {small_count} statements for {len(small_rows)} rows, '
+        f'{large_count} for {len(large_rows)} rows'
+    )
+    return large_count
+
+
+# Article i was published i * 6 hours after this (Vietnam time), RFC 822 in published
+PUBLISHED_START = datetime(2024, 3, 1, tzinfo=timezone(timedelta(hours=7)))
+
+
+def seed():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = TestingSession()
+    db.add(User(id=1, username='reader', hashed_password='x'))
+    # One source per article so per-row lazy loads cannot hit the identity map
+    for i in range(1, 61):
+        db.add(RSSSource(id=i, name=f'Nguồn {i}', url=f'https://source{i}.example/rss', category='Thời sự'))
+    started = datetime(2025, 1, 1)
+    for i in range(1, 61):
+        published_at = PUBLISHED_START + timedelta(hours=6 * i)
+        db.add(Article(
+            id=i, title=f'Bài {i}', link=f'https://source.example/{i}',
+            content='<p>nội dung</p>', source_id=i,
+            # Stored in UTC, as a timestamptz column returns it
+            published=format_datetime(published_at), published_at=published_at.astimezone(timezone.utc),
+            fetched_at=started + timedelta(minutes=i),
+        ))
+    db.flush()
+    for i in range(1, 41):
+        db.add(SavedArticle(user_id=1, article_id=i, saved_at=started + timedelta(minutes=i)))
+        db.add(ReadingHistory(user_id=1, article_id=i, read_at=started + timedelta(minutes=i)))
+    db.commit()
+    db.close()
+
+
+def test_list_articles_query_count():
+    """Test the article list loads sources with the page, not per article"""
+    print("Testing list_articles query count...")
+
+    seed()
+    count = assert_constant_queries('/api/v1/articles', 5, 50)
+    assert count == 1, f'{count} statements'
+    assert_constant_queries('/api/v1/articles', 2, 10, ids=list(range(1, 11)))
+
+    print("✓ list_articles query count test passed")
+    return True
+
+
+def test_user_lists_query_count():
+    """Test saved articles and reading history stay constant as they grow"""
+    print("Testing saved/history query count...")
+
+    seed()
+    small, _ = statement_count('/api/v1/articles/saved', user_id=1)
+    small_history, _ = statement_count('/api/v1/articles/history', user_id=1)
+
+    db = TestingSession()
+    for i in range(41, 61):
+        db.add(SavedArticle(user_id=1, article_id=i))
+        db.add(ReadingHistory(user_id=1, article_id=i))
+    db.commit()
+    db.close()
+
+    large, saved = statement_count('/api/v1/articles/saved', user_id=1)
+    large_history, history = statement_count('/api/v1/articles/history', user_id=1)
+    assert len(saved) == 60 and len(history) == 60
+    assert large == small
+    assert large_history == small_history
+
+    print("✓ saved/history query count test passed")
+    return True
+
+
+def test_get_article_query_count():
+    """Test the detail view fetches the article and its source together"""
+    seed()
+    count, article = statement_count('/api/v1/articles/7')
+    assert article['source']['id'] == 7
+    assert article['content']
+    assert count == 1, f'{count} statements'
+    return True
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Query Count Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_list_articles_query_count,
+        test_user_lists_query_count,
+        test_get_article_query_count,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
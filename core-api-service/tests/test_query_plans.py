@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Query-plan tests for the article endpoints: every table an endpoint reads must
+be reached through an index, never a full scan. Uses SQLite's EXPLAIN QUERY PLAN
+on the statements the endpoints actually execute, with the schema built from
+the models (so an index dropped from models.py fails here).
+"""
+import sys
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from test_query_counts import engine, client, seed
+
+# A plan line reading a table without an index, e.g. "SCAN articles"
+FULL_SCAN_RE = re.compile(r'^SCAN (\w+)$')
+
+
+@contextmanager
+def capture_selects():
+    """Collect (statement, parameters) of every SELECT run on the test engine"""
+    selects = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            selects.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield selects
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def query_plans(path, **params):
+    """EXPLAIN QUERY PLAN detail lines for each SELECT a GET request runs"""
+    with capture_selects() as selects:
+        response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    assert selects, f'{path} ran no SELECT'
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in selects:
+            rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+            plans.append([row[-1] for row in rows])
+    return plans
+
+
+def assert_uses_indexes(path, search=None, sorted_by_index=True, **params):
+    """Fail on full table scans, and on an explicit sort when the index should order rows.
+
+    ``search`` names the table the filter must look up through an index
+    (SEARCH), rather than walking a whole index and filtering (SCAN ... USING INDEX).
+    """
+    plan = [line for lines in query_plans(path, **params) for line in lines]
+    full_scans = [line for line in plan if FULL_SCAN_RE.match(line)]
+    assert not full_scans, f'{path} {params}: {plan}'
+    if search:
+        assert any(line.startswith(f'SEARCH {search} ') for line in plan), f'{path} {params}: {plan}'
+    if sorted_by_index:
+        assert not any('TEMP B-TREE' in line for line in plan), f'{path} {params}: {plan}'
+
+
+def test_article_list_plans():
+    """Test the article list reads through an index for each filter"""
+    print("Testing article list query plans...")
+
+    seed()
+    assert_uses_indexes('/api/v1/articles')
+    assert_uses_indexes('/api/v1/articles', search='articles', source_id=3)
+    assert_uses_indexes('/api/v1/articles', search='articles', category='Kinh doanh')
+    assert_uses_indexes('/api/v1/articles', search='articles', sorted_by_index=False, ids=[1, 2, 3])
+    # The planner may walk ix_articles_fetched_at_id or range-scan ix_articles_published_at
+    assert_uses_indexes('/api/v1/articles', date_from='2025-01-01', sorted_by_index=False)
+
+    print("✓ article list query plan test passed")
+    return True
+
+
+def test_user_list_plans():
+    """Test saved articles and reading history look rows up by user_id"""
+    print("Testing saved/history query plans...")
+
+    seed()
+    assert_uses_indexes('/api/v1/articles/saved', search='saved_articles', user_id=1)
+    assert_uses_indexes('/api/v1/articles/history', search='reading_history', user_id=1)
+    assert_uses_indexes('/api/v1/articles/saved/7', search='saved_articles', user_id=1)
+
+    print("✓ saved/history query plan test passed")
+    return True
+
+
+def test_article_detail_plan():
+    """Test the detail view is a primary key lookup"""
+    seed()
+    assert_uses_indexes('/api/v1/articles/7', search='articles')
+    return True
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Query Plan Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_article_list_plans,
+        test_user_list_plans,
+        test_article_detail_plan,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the crawled_data worker (no RabbitMQ, Postgres or model needed).
+Upserts are compiled for the postgresql dialect and recorded instead of run;
+every other query runs on in-memory SQLite.
+"""
+import sys
+import os
+import json
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.dml import Insert
+
+from src import worker
+from src.models import Base, Article, IndexOutbox
+
+engine = create_engine(
+    'sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool
+)
+
+# (sql, params) of every upsert, links whose upsert should fail, links classified
+UPSERTS = []
+FAILING_LINKS = set()
+CLASSIFIED = []
+ARTICLE_IDS = {}
+# Set to make every commit fail, like a constraint or connection error at COMMIT
+FAIL_COMMIT = []
+
+
+def compile_pg(statement):
+    compiled = statement.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def set_clause(sql):
+    """Column assignments of the ON CONFLICT ... DO UPDATE SET clause"""
+    assignments = sql.split('DO UPDATE SET ', 1)[1].split(' RETURNING ', 1)[0]
+    return dict(a.split(' = ', 1) for a in re.split(r', (?=\w+ = )', assignments))
+
+
+class RecordingSession(Session):
+    """Session that records pg upserts and answers them like RETURNING would"""
+    def execute(self, statement, *args, **kwargs):
+        if not isinstance(statement, Insert):
+            return super().execute(statement, *args, **kwargs)
+        sql, params = compile_pg(statement)
+        UPSERTS.append((sql, params))
+        rows = []
+        for i in range(len([k for k in params if k.startswith('link_m')])):
+            link = params[f'link_m{i}']
+            if link in FAILING_LINKS:
+                raise ValueError(f'cannot save {link}')
+            rows.append(SimpleNamespace(
+                id=ARTICLE_IDS.setdefault(link, len(ARTICLE_IDS) + 1), link=link,
+                title=params[f'title_m{i}'], content=params[f'content_m{i}'],
+                summary=params[f'summary_m{i}'], content_hash=params[f'content_hash_m{i}'],
+            ))
+        return rows
+
+    def commit(self):
+        if FAIL_COMMIT:
+            raise ValueError('commit failed')
+        super().commit()
+
+
+class FakeChannel:
+    def __init__(self, fail_publish=False):
+        self.fail_publish = fail_publish
+        self.published = []
+        self.headers = []
+        self.acked = []
+        self.nacked = []
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        if self.fail_publish:
+            raise ConnectionError('broker unreachable')
+        self.published.append((routing_key, json.loads(body)))
+        self.headers.append(properties.headers if properties else None)
+
+    def basic_ack(self, delivery_tag):
+        self.acked.append(delivery_tag)
+
+    def basic_nack(self, delivery_tag, requeue=True):
+        self.nacked.append(delivery_tag)
+
+
+def fake_classify_batch(articles, return_embeddings=False):
+    articles = list(articles)
+    CLASSIFIED.extend(a['link'] for a in articles)
+    return [('Kinh doanh', 0.9)] * len(articles), [[0.1, 0.2]] * len(articles)
+
+
+def reset():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    UPSERTS.clear()
+    FAILING_LINKS.clear()
+    CLASSIFIED.clear()
+    FAIL_COMMIT.clear()
+    worker.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RecordingSession)
+    worker.classify_batch = fake_classify_batch
+
+
+def deliveries(*articles):
+    return [(SimpleNamespace(delivery_tag=i), json.dumps(a)) for i, a in enumerate(articles, 1)]
+
+
+def article(link, **fields):
+    return {'title': f'Bài {link}', 'link': link, 'content': '<p>nội dung</p>',
+            'summary': 'tóm tắt', 'published': 'Mon, 01 Jan 2024 10:00:00 +0700',
+            'image_url': None, 'source_id': 1, **fields}
+
+
+def test_merge_duplicate_links():
+    """Test repeated links collapse to one row without losing content or source"""
+    print("Testing duplicate link merge...")
+
+    rows = worker._merge_duplicate_links([
+        (article('a', title='cũ', content='<p>đầy đủ</p>'), 'Kinh doanh'),
+        (article('b'), 'Thể thao'),
+        (article('a', title='mới', content='', source_id=None), 'Công nghệ'),
+    ])
+
+    assert [row['link'] for row in rows] == ['a', 'b']
+    merged = rows[0]
+    assert merged['title'] == 'mới'
+    assert merged['category'] == 'Công nghệ'
+    assert merged['content'] == '<p>đầy đủ</p>'
+    assert merged['source_id'] == 1
+    assert merged['content_hash'] == worker.article_fingerprint(article('a', title='mới', content='', source_id=None))
+
+    print("✓ duplicate link merge test passed")
+    return True
+
+
+def test_upsert_never_blanks_content():
+    """Test only the with-content upsert assigns content on conflict"""
+    print("Testing upsert content rule...")
+
+    row = {**article('a', content=''), 'category': 'Kinh doanh', 'content_hash': 'h'}
+    sql, params = compile_pg(worker._upsert_statement([row], update_content=False))
+    assignments = set_clause(sql)
+    assert 'content' not in assignments
+    # A new row without crawled content starts from its summary
+    assert params['content_m0'] == 'tóm tắt'
+    assert assignments['source_id'] == 'coalesce(excluded.source_id, articles.source_id)'
+    assert assignments['content_hash'] == 'excluded.content_hash'
+
+    row = {**article('a'), 'category': 'Kinh doanh', 'content_hash': 'h'}
+    sql, params = compile_pg(worker._upsert_statement([row], update_content=True))
+    assert set_clause(sql)['content'] == 'excluded.content'
+    assert params['content_m0'] == '<p>nội dung</p>'
+
+    print("✓ upsert content rule test passed")
+    return True
+
+
+def test_save_splits_rows_by_content():
+    """Test a batch is saved with one upsert per content group, one row per item"""
+    reset()
+    db = worker.SessionLocal()
+    items = [(article('a'), 'x'), (article('b', content='  '), 'x'), (article('a'), 'x')]
+    rows = worker.save_articles_to_db(items, db)
+    db.close()
+
+    assert len(UPSERTS) == 2
+    with_content, without_content = UPSERTS
+    assert 'content' in set_clause(with_content[0])
+    assert with_content[1]['link_m0'] == 'a' and 'link_m1' not in with_content[1]
+    assert 'content' not in set_clause(without_content[0])
+    assert without_content[1]['link_m0'] == 'b'
+    assert [row['id'] for row in rows] == [ARTICLE_IDS['a'], ARTICLE_IDS['b'], ARTICLE_IDS['a']]
+    return True
+
+
+def test_batch_failure_falls_back_per_row():
+    """Test one unsaveable article is nacked alone while the rest are saved and indexed"""
+    print("Testing per-row fallback...")
+
+    reset()
+    FAILING_LINKS.add('bad')
+    channel = FakeChannel()
+    worker.process_crawled_batch(channel, deliveries(article('a'), article('bad'), article('c')))
+
+    assert channel.nacked == [2]
+    assert sorted(channel.acked) == [1, 3]
+    # Batch attempt, then one upsert per article
+    assert len(UPSERTS) == 4
+    indexed = [a['id'] for _, request in channel.published for a in request['articles']]
+    assert indexed == [ARTICLE_IDS['a'], ARTICLE_IDS['c']]
+
+    print("✓ per-row fallback test passed")
+    return True
+
+
+def outbox_size():
+    db = worker.SessionLocal()
+    try:
+        return db.query(IndexOutbox).count()
+    finally:
+        db.close()
+
+
+def test_rolled_back_batch_is_not_indexed():
+    """Test articles whose transaction fails to commit never reach the index queue"""
+    print("Testing rolled back batch...")
+
+    reset()
+    FAIL_COMMIT.append(True)
+    channel = FakeChannel()
+    worker.process_crawled_batch(channel, deliveries(article('a'), article('b')))
+
+    assert channel.published == []
+    assert sorted(channel.nacked) == [1, 2]
+    FAIL_COMMIT.clear()
+    assert outbox_size() == 0
+
+    print("✓ rolled back batch test passed")
+    return True
+
+
+def test_failed_publish_stays_in_outbox():
+    """Test an unpublished index request survives for the next publish"""
+    print("Testing outbox redelivery...")
+
+    reset()
+    broken = FakeChannel(fail_publish=True)
+    try:
+        worker.process_crawled_batch(broken, deliveries(article('a')))
+        assert False, 'IndexEnqueueError not raised'
+    except worker.IndexEnqueueError:
+        pass
+    # Nothing acked: the consumer reconnects and the message is redelivered
+    assert broken.acked == [] and outbox_size() == 1
+
+    channel = FakeChannel()
+    worker.publish_index_outbox(channel)
+    assert [request['articles'][0]['id'] for _, request in channel.published] == [ARTICLE_IDS['a']]
+    assert outbox_size() == 0
+
+    print("✓ outbox redelivery test passed")
+    return True
+
+
+def store(data):
+    """Insert ``data`` as an already ingested article with its fingerprint"""
+    db = worker.SessionLocal()
+    db.add(Article(title=data['title'], link=data['link'], content=data['content'],
+                   content_hash=worker.article_fingerprint(data)))
+    db.commit()
+    db.close()
+
+
+def test_identical_recrawl_is_skipped():
+    """Test an unchanged re-crawl is acked without classify, upsert or enqueue"""
+    print("Testing unchanged re-crawl skip...")
+
+    reset()
+    store(article('a'))
+    channel = FakeChannel()
+    worker.process_crawled_batch(channel, deliveries(article('a')))
+
+    assert channel.acked == [1]
+    assert CLASSIFIED == [] and UPSERTS == [] and channel.published == []
+
+    print("✓ unchanged re-crawl skip test passed")
+    return True
+
+
+def test_any_field_change_is_processed():
+    """Test changing any fingerprinted field sends the article through every stage"""
+    print("Testing changed re-crawl...")
+
+    for field in worker.FINGERPRINT_FIELDS:
+        reset()
+        stored = article(f'{field}-x')
+        store(stored)
+        changed = {**stored, field: 2 if field == 'source_id' else f'{stored[field]} (sửa)'}
+        assert worker.article_fingerprint(changed) != worker.article_fingerprint(stored), field
+
+        channel = FakeChannel()
+        worker.process_crawled_batch(channel, deliveries(stored, changed))
+        # The identical copy is skipped; the changed one is classified, saved and queued
+        assert CLASSIFIED == [changed['link']], field
+        assert len(UPSERTS) == 1 and len(channel.published) == 1, field
+        assert sorted(channel.acked) == [1, 2], field
+
+    print("✓ changed re-crawl test passed")
+    return True
+
+
+def test_parse_published():
+    """Test RSS and ISO dates parse to aware datetimes and junk to None"""
+    print("Testing published date parsing...")
+
+    vietnam = timezone(timedelta(hours=7))
+    cases = {
+        'Mon, 01 Jan 2024 10:00:00 +0700': datetime(2024, 1, 1, 10, tzinfo=vietnam),
+        'Tue, 2 Apr 2024 09:15:00 GMT': datetime(2024, 4, 2, 9, 15, tzinfo=timezone.utc),
+        '2024-03-05T08:00:00Z': datetime(2024, 3, 5, 8, tzinfo=timezone.utc),
+        '2024-03-05T08:00:00+07:00': datetime(2024, 3, 5, 8, tzinfo=vietnam),
+        # No offset: taken as UTC
+        '2024-03-05': datetime(2024, 3, 5, tzinfo=timezone.utc),
+        '  2024-03-05 08:00:00  ': datetime(2024, 3, 5, 8, tzinfo=timezone.utc),
+    }
+    for value, expected in cases.items():
+        parsed = worker.parse_published(value)
+        assert parsed == expected and parsed.utcoffset() == expected.utcoffset(), (value, parsed)
+
+    for value in (None, '', '   ', 'hôm qua', '32/13/2024'):
+        assert worker.parse_published(value) is None, value
+
+    print("✓ published date parsing test passed")
+    return True
+
+
+def batches_at(timeline, batch_size=3, max_wait=0.5):
+    """Run micro_batches over (seconds, delivery_tag or None) events on a fake clock.
+
+    Returns the delivery tags of each batch with the time it was flushed.
+    """
+    now = [0.0]
+
+    def events():
+        for at, tag in timeline:
+            now[0] = at
+            method = None if tag is None else SimpleNamespace(delivery_tag=tag)
+            yield method, None, None if tag is None else f'body {tag}'
+
+    return [
+        ([method.delivery_tag for method, _ in batch], now[0])
+        for batch in worker.micro_batches(events(), batch_size, max_wait, clock=lambda: now[0])
+    ]
+
+
+def test_micro_batch_flushes_at_size():
+    """Test a full batch is flushed on its last message, before the deadline"""
+    batches = batches_at([(0.0, 1), (0.1, 2), (0.2, 3), (0.25, 4), (0.3, 5), (0.35, 6), (0.4, 7)])
+    assert batches == [([1, 2, 3], 0.2), ([4, 5, 6], 0.35)]
+    return True
+
+
+def test_micro_batch_flushes_at_deadline():
+    """Test a partial batch is flushed on the first message past its deadline"""
+    batches = batches_at([(0.0, 1), (0.3, 2), (0.6, 3), (0.7, 4), (1.0, 5), (1.3, 6)], batch_size=10)
+    # The deadline is set by a batch's first message: 0.5 for [1..], 1.2 for [4..]
+    assert batches == [([1, 2, 3], 0.6), ([4, 5, 6], 1.3)]
+    return True
+
+
+def test_micro_batch_flushes_when_idle():
+    """Test idle events flush a waiting partial batch once its deadline passes"""
+    batches = batches_at([(0.0, 1), (0.1, None), (0.4, None), (0.5, None), (0.6, None), (0.7, 2), (1.3, None)])
+    assert batches == [([1], 0.5), ([2], 1.3)]
+    # Idle with nothing buffered yields nothing
+    assert batches_at([(0.0, None), (5.0, None)]) == []
+    return True
+
+
+def index_run(responses, rounds=None, body=None):
+    """Run process_index_request against a mock recommendation service.
+
+    ``responses`` are (status, json) replies, the last one repeated. Returns
+    the channel, the number of HTTP calls and the backoff sleeps.
+    """
+    calls, sleeps = [], []
+
+    def handler(request):
+        status, payload = responses[min(len(calls), len(responses) - 1)]
+        calls.append(json.loads(request.content))
+        return httpx.Response(status, json=payload)
+
+    worker.time = SimpleNamespace(sleep=sleeps.append, perf_counter=time.perf_counter, monotonic=time.monotonic)
+    channel = FakeChannel()
+    properties = SimpleNamespace(headers=None if rounds is None else {worker.INDEX_ROUNDS_HEADER: rounds})
+    if body is None:
+        body = json.dumps({'articles': [{'id': 1, 'title': 'Bài 1', 'content': 'nội dung'}]})
+    client = httpx.Client(base_url='http://recommendation', transport=httpx.MockTransport(handler))
+    try:
+        worker.process_index_request(client, channel, SimpleNamespace(delivery_tag=7), properties, body)
+    finally:
+        client.close()
+        worker.time = time
+    return channel, len(calls), sleeps
+
+
+def indexed(count):
+    return {'indexed': count, 'unchanged': 0, 'count': count,
+            'results': [{'status': 'success', 'id': i} for i in range(count)]}
+
+
+def test_index_success_is_acked():
+    """Test an indexed batch is acked once, without retries or republishing"""
+    print("Testing indexer success...")
+
+    before = worker.worker_metrics['indexer']['indexed']
+    channel, calls, sleeps = index_run([(200, indexed(1))])
+    assert calls == 1 and sleeps == []
+    assert channel.acked == [7] and channel.published == [] and channel.nacked == []
+    assert worker.worker_metrics['indexer']['indexed'] == before + 1
+
+    # A failed attempt is retried within the same delivery
+    channel, calls, sleeps = index_run([(503, {}), (200, indexed(1))])
+    assert calls == 2 and sleeps == [worker.INDEX_RETRY_BACKOFF_SECONDS]
+    assert channel.acked == [7] and channel.published == []
+
+    print("✓ indexer success test passed")
+    return True
+
+
+def test_index_exhaustion_requeues():
+    """Test a batch failing every attempt goes to the queue tail with one more round"""
+    print("Testing indexer requeue...")
+
+    for reply in ((503, {}), (429, {}), (200, {'unexpected': True})):
+        channel, calls, sleeps = index_run([reply], rounds=1)
+        assert calls == worker.INDEX_MAX_ATTEMPTS, reply
+        # Exponential backoff between attempts, none after the last one
+        assert sleeps == [worker.INDEX_RETRY_BACKOFF_SECONDS * 2 ** i
+                          for i in range(worker.INDEX_MAX_ATTEMPTS - 1)], reply
+        assert [queue for queue, _ in channel.published] == [worker.INDEX_QUEUE], reply
+        assert channel.headers == [{worker.INDEX_ROUNDS_HEADER: 2}], reply
+        assert channel.acked == [7], reply
+
+    # A first delivery has no header yet
+    channel, _, _ = index_run([(500, {})])
+    assert channel.headers == [{worker.INDEX_ROUNDS_HEADER: 1}]
+
+    print("✓ indexer requeue test passed")
+    return True
+
+
+def test_index_final_round_is_dead_lettered():
+    """Test the INDEX_MAX_ROUNDS-th failed round parks the batch on the dead-letter queue"""
+    print("Testing indexer dead-lettering...")
+
+    channel, calls, _ = index_run([(503, {})], rounds=worker.INDEX_MAX_ROUNDS - 1)
+    assert calls == worker.INDEX_MAX_ATTEMPTS
+    assert [queue for queue, _ in channel.published] == [worker.INDEX_DEAD_LETTER_QUEUE]
+    assert channel.published[0][1]['articles'][0]['id'] == 1
+    assert channel.headers == [{worker.INDEX_ROUNDS_HEADER: worker.INDEX_MAX_ROUNDS}]
+    assert channel.acked == [7]
+
+    print("✓ indexer dead-lettering test passed")
+    return True
+
+
+def test_index_rejected_batch_is_dead_lettered():
+    """Test a non-retryable 4xx goes straight to the dead-letter queue"""
+    print("Testing rejected index batch...")
+
+    for status in (404, 422):
+        channel, calls, sleeps = index_run([(status, {'detail': 'Not Found'})])
+        assert calls == 1 and sleeps == [], status
+        assert [queue for queue, _ in channel.published] == [worker.INDEX_DEAD_LETTER_QUEUE], status
+        assert channel.acked == [7], status
+
+    # An unreadable request is rejected without calling the service
+    channel, calls, _ = index_run([(200, indexed(1))], body='{not json')
+    assert calls == 0
+    assert channel.nacked == [7] and channel.acked == [] and channel.published == []
+
+    print("✓ rejected index batch test passed")
+    return True
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Worker Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_merge_duplicate_links,
+        test_upsert_never_blanks_content,
+        test_save_splits_rows_by_content,
+        test_batch_failure_falls_back_per_row,
+        test_rolled_back_batch_is_not_indexed,
+        test_failed_publish_stays_in_outbox,
+        test_identical_recrawl_is_skipped,
+        test_any_field_change_is_processed,
+        test_parse_published,
+        test_micro_batch_flushes_at_size,
+        test_micro_batch_flushes_at_deadline,
+        test_micro_batch_flushes_when_idle,
+        test_index_success_is_acked,
+        test_index_exhaustion_requeues,
+        test_index_final_round_is_dead_lettered,
+        test_index_rejected_batch_is_dead_lettered,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,128 @@
+"""
+Charset resolution for downloaded article pages.
+Order: Content-Type header -> <meta> charset in the first bytes -> last charset
+seen for the same host. The body is decoded exactly once, so BeautifulSoup gets
+text and skips its own encoding sniffing.
+"""
+
+import codecs
+import re
+import threading
+from typing import Dict, Optional, Union
+
+# Bytes scanned for a <meta charset>; declarations must appear early in <head>
+PRESCAN_BYTES = 4096
+
+META_CHARSET_RE = re.compile(
+    rb'<meta[^>]+?charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.I
+)
+
+
+def normalize_charset(name) -> Optional[str]:
+    """Python codec name for a declared charset, or None if unknown."""
+    if isinstance(name, bytes):
+        name = name.decode('ascii', 'ignore')
+    name = (name or '').strip().strip('"\'')
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def header_charset(content_type: str) -> Optional[str]:
+    """Charset parameter of a Content-Type header."""
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            return normalize_charset(value)
+    return None
+
+
+def meta_charset(head: bytes) -> Optional[str]:
+    """Charset from <meta charset> or <meta http-equiv content="...charset=..."> in ``head``."""
+    match = META_CHARSET_RE.search(head[:PRESCAN_BYTES])
+    return normalize_charset(match.group(1)) if match else None
+
+
+class CharsetCache:
+    """Last resolved charset per host, used for pages that declare none."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_host: Dict[str, str] = {}
+
+    def get(self, host: str) -> Optional[str]:
+        with self._lock:
+            return self._by_host.get(host)
+
+    def set(self, host: str, charset: str) -> None:
+        with self._lock:
+            self._by_host[host] = charset
+
+
+class PageDecoder:
+    """Incrementally decodes a streamed page once its charset is known.
+
+    Chunks are held back until the header, the meta prescan or the host cache
+    names a charset; from then on they are decoded as they arrive. A page with
+    no charset anywhere is tried as strict UTF-8 at the end and otherwise
+    returned as bytes for BeautifulSoup to sniff.
+    """
+
+    def __init__(self, content_type: str, host: str, cache: CharsetCache):
+        self.host = host
+        self.cache = cache
+        self.charset = header_charset(content_type)
+        self.source = 'header' if self.charset else None
+        self._pending = bytearray()
+        self._decoder = None
+        self._parts = []
+        if self.charset:
+            self._start()
+
+    def _start(self):
+        self._decoder = codecs.getincrementaldecoder(self.charset)(errors='replace')
+        if self._pending:
+            self._parts.append(self._decoder.decode(bytes(self._pending)))
+            self._pending = bytearray()
+
+    def _resolve(self) -> None:
+        charset = meta_charset(bytes(self._pending))
+        if charset:
+            self.charset, self.source = charset, 'meta'
+        else:
+            self.charset = self.cache.get(self.host)
+            self.source = 'domain' if self.charset else None
+        if self.charset:
+            self._start()
+
+    def feed(self, chunk: bytes) -> None:
+        if self._decoder is not None:
+            self._parts.append(self._decoder.decode(chunk))
+            return
+        self._pending += chunk
+        if len(self._pending) >= PRESCAN_BYTES and self.source is None:
+            self._resolve()
+            if self.source is None:
+                # Nothing declared up front; keep buffering and decide at the end
+                self.source = 'undeclared'
+
+    def finish(self) -> Union[str, bytes]:
+        if self._decoder is None and self.source is None:
+            self._resolve()
+        if self._decoder is not None:
+            self._parts.append(self._decoder.decode(b'', final=True))
+            if self.source in ('header', 'meta'):
+                self.cache.set(self.host, self.charset)
+            return ''.join(self._parts)
+
+        body = bytes(self._pending)
+        try:
+            text = body.decode('utf-8')
+        except UnicodeDecodeError:
+            self.charset, self.source = None, 'sniffed'
+            return body
+        self.charset, self.source = 'utf-8', 'utf-8'
+        return text
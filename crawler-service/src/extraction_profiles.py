@@ -0,0 +1,91 @@
+"""
+Per-domain extraction profiles.
+Known news sites go straight to their article body container with precompiled
+CSS selectors; unknown hosts use ArticleCrawler's generic selector cascade.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import soupsieve
+
+
+@dataclass
+class ExtractionProfile:
+    name: str
+    hosts: Tuple[str, ...]
+    # CSS selectors for the body container, tried in order
+    body_selectors: Tuple[str, ...]
+    _compiled: list = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._compiled = [soupsieve.compile(selector) for selector in self.body_selectors]
+
+    def matches_host(self, host: str) -> bool:
+        return any(host == h or host.endswith('.' + h) for h in self.hosts)
+
+    def find_body(self, soup):
+        for selector in self._compiled:
+            body = selector.select_one(soup)
+            if body is not None:
+                return body
+        return None
+
+
+PROFILES = (
+    ExtractionProfile(
+        name='vnexpress',
+        hosts=('vnexpress.net',),
+        body_selectors=('article.fck_detail', 'div.fck_detail'),
+    ),
+    ExtractionProfile(
+        name='thanhnien',
+        hosts=('thanhnien.vn',),
+        body_selectors=('div.detail-content', 'div.afcbc-body', 'div.detail__cmain-main'),
+    ),
+    ExtractionProfile(
+        name='tuoitre',
+        hosts=('tuoitre.vn',),
+        body_selectors=('div.detail-content', 'div#main-detail-body'),
+    ),
+    ExtractionProfile(
+        name='dantri',
+        hosts=('dantri.com.vn',),
+        body_selectors=('div.singular-content', 'div.dt-news__content'),
+    ),
+)
+
+
+def profile_for_url(url: str) -> Optional[ExtractionProfile]:
+    host = (urlparse(url).hostname or '').lower()
+    for profile in PROFILES:
+        if profile.matches_host(host):
+            return profile
+    return None
+
+
+class ProfileStats:
+    """Thread-safe hit/miss counters per profile ('generic' counts unknown hosts)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, name: str, hit: bool) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(name, {'hit': 0, 'miss': 0})
+            counts['hit' if hit else 'miss'] += 1
+
+    def merge(self, snapshot: Dict[str, Dict[str, int]]) -> None:
+        """Add counts collected elsewhere, e.g. in an extraction worker process."""
+        with self._lock:
+            for name, counts in snapshot.items():
+                totals = self._counts.setdefault(name, {'hit': 0, 'miss': 0})
+                totals['hit'] += counts.get('hit', 0)
+                totals['miss'] += counts.get('miss', 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._counts.items()}
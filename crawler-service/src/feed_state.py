@@ -0,0 +1,90 @@
+"""
+Per-source feed polling state (ETag, Last-Modified, body hash, seen entries).
+Persisted in Redis so unchanged feeds can be skipped across restarts.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+MAX_SEEN_GUIDS = 500
+
+
+@dataclass
+class FeedState:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    seen_guids: List[str] = field(default_factory=list)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def is_unchanged(self, status_code: int, body: bytes) -> bool:
+        """True when the server answered 304 or sent the same document again."""
+        if status_code == 304:
+            return True
+        return self.content_hash is not None and self.content_hash == hash_body(body)
+
+    def update_validators(self, headers, body: bytes) -> None:
+        self.etag = headers.get('ETag')
+        self.last_modified = headers.get('Last-Modified')
+        self.content_hash = hash_body(body)
+
+    def remember(self, guids: Iterable[str]) -> None:
+        """Record processed entry ids, newest first, capped at MAX_SEEN_GUIDS."""
+        merged = list(dict.fromkeys([g for g in guids if g] + self.seen_guids))
+        self.seen_guids = merged[:MAX_SEEN_GUIDS]
+
+
+def hash_body(body: bytes) -> str:
+    return hashlib.sha256(body or b'').hexdigest()
+
+
+class FeedStateStore:
+    """Redis-backed store; keeps state in memory while Redis is unreachable."""
+
+    def __init__(self, host: str, port: int, prefix: str = 'crawler:feed_state:', ttl_seconds: int = 30 * 24 * 3600):
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        # Fail fast: a missing Redis must not stall the crawl, state then lives in memory
+        self._redis = redis.Redis(
+            host=host, port=port, socket_timeout=2, socket_connect_timeout=2, retry=Retry(NoBackoff(), 1)
+        )
+        self._memory: Dict[str, str] = {}
+
+    def load(self, url: str) -> FeedState:
+        raw = None
+        try:
+            raw = self._redis.get(self.prefix + url)
+        except redis.RedisError as e:
+            logger.warning(f'Feed state lookup failed, using in-memory state: {e}')
+            raw = self._memory.get(url)
+        if not raw:
+            return FeedState()
+        try:
+            return FeedState(**json.loads(raw))
+        except (ValueError, TypeError) as e:
+            logger.warning(f'Discarding unreadable feed state for {url}: {e}')
+            return FeedState()
+
+    def save(self, url: str, state: FeedState) -> None:
+        raw = json.dumps(asdict(state))
+        self._memory[url] = raw
+        try:
+            self._redis.set(self.prefix + url, raw, ex=self.ttl_seconds)
+        except redis.RedisError as e:
+            logger.warning(f'Feed state save failed, kept in memory only: {e}')
@@ -6,19 +6,19 @@ import logging
 import threading
 import time
 import re
-import ssl
-import urllib.request
-from urllib.error import URLError
 from html.parser import HTMLParser
 
 import feedparser
 import psycopg2
 import pika
+import requests
 from fastapi import FastAPI
 import uvicorn
 
 from dotenv import load_dotenv
 from web_crawler import ArticleCrawler
+from publisher import CrawledDataPublisher
+from feed_state import FeedState, FeedStateStore
 
 # Load environment variables from .env file
 load_dotenv()
@@ -35,6 +35,28 @@ RABBITMQ_PORT = int(os.getenv('RABBITMQ_PORT', '5672'))
 RABBITMQ_USER = os.getenv('RABBITMQ_USER', 'guest')
 RABBITMQ_PASSWORD = os.getenv('RABBITMQ_PASSWORD', 'guest')
 
+REDIS_HOST = os.getenv('REDIS_HOST', 'redis')
+REDIS_PORT = int(os.getenv('REDIS_PORT', '6379'))
+
+# Article page downloads per feed: total concurrent requests and per-host cap
+CRAWL_MAX_WORKERS = int(os.getenv('CRAWL_MAX_WORKERS', '8'))
+CRAWL_MAX_PER_HOST = int(os.getenv('CRAWL_MAX_PER_HOST', '4'))
+CRAWL_HTTP_RETRIES = int(os.getenv('CRAWL_HTTP_RETRIES', '2'))
+# Processes that parse/clean downloaded pages (0 = parse on the download threads).
+# Defaults to the cores this process may use, not the host's, capped because every
+# spawned worker re-imports this module
+CRAWL_EXTRACT_WORKERS = int(os.getenv(
+    'CRAWL_EXTRACT_WORKERS',
+    str(min(len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1, 4))
+))
+# Article pages above this size are abandoned mid-download
+CRAWL_MAX_PAGE_BYTES = int(os.getenv('CRAWL_MAX_PAGE_BYTES', str(5 * 1024 * 1024)))
+# BeautifulSoup backend for article pages: html.parser | lxml | html5lib
+CRAWL_HTML_PARSER = os.getenv('CRAWL_HTML_PARSER', 'html.parser')
+
+# Messages committed to crawled_data per broker round trip
+PUBLISH_BATCH_SIZE = int(os.getenv('PUBLISH_BATCH_SIZE', '50'))
+
 # Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger('crawler-service')
@@ -78,6 +100,8 @@ def strip_html_and_extract_images(html_text):
 crawl_metrics = {
     "total_crawled": 0,
     "total_new": 0,
+    "feeds_not_modified": 0,
+    "skipped_known": 0,
     "last_crawl": None
 }
 
@@ -97,39 +121,127 @@ def metrics():
     return {
         "total_articles_crawled": crawl_metrics["total_crawled"],
         "total_new_articles": crawl_metrics["total_new"],
-        "last_crawl_time": crawl_metrics["last_crawl"]
+        "feeds_not_modified": crawl_metrics["feeds_not_modified"],
+        "skipped_known_articles": crawl_metrics["skipped_known"],
+        "last_crawl_time": crawl_metrics["last_crawl"],
+        "extraction_profiles": web_crawler.profile_stats.snapshot(),
+        "downloads": {
+            **web_crawler.download_stats,
+            "last_crawl_memory": web_crawler.last_crawl_memory
+        },
+        "publisher": {
+            **(_publisher.stats if _publisher else {}),
+            "messages_per_second": _publisher.messages_per_second() if _publisher else None
+        }
     }
 
-def _fetch_with_ua(url: str) -> bytes:
-    req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    ctx = ssl._create_unverified_context()
-    with urllib.request.urlopen(req, context=ctx, timeout=15) as resp:
-        return resp.read()
+def find_ingested_links(links):
+    """Return the subset of links already stored in articles with crawled content.
+
+    Rows whose content is missing or just the RSS summary (a failed crawl) are
+    treated as stale and not returned, so they get crawled again.
+    """
+    if not links:
+        return set()
+    try:
+        conn = psycopg2.connect(
+            host=DB_HOST, port=DB_PORT, dbname=DB_NAME,
+            user=DB_USER, password=DB_PASSWORD, connect_timeout=5
+        )
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT link FROM articles
+                    WHERE link = ANY(%s)
+                      AND content IS NOT NULL AND content <> ''
+                      AND content IS DISTINCT FROM summary
+                    """,
+                    (list(links),)
+                )
+                return {row[0] for row in cur.fetchall()}
+        finally:
+            conn.close()
+    except psycopg2.Error as e:
+        logger.warning(f'Known-link lookup failed, crawling all entries: {e}')
+        return set()
+
+# Shared across crawl tasks so keep-alive connections survive between feeds
+web_crawler = ArticleCrawler(
+    max_workers=CRAWL_MAX_WORKERS,
+    max_per_host=CRAWL_MAX_PER_HOST,
+    retries=CRAWL_HTTP_RETRIES,
+    parser=CRAWL_HTML_PARSER,
+    extract_workers=CRAWL_EXTRACT_WORKERS,
+    max_body_bytes=CRAWL_MAX_PAGE_BYTES
+)
+
+# ETag / Last-Modified / seen entries per feed URL
+feed_states = FeedStateStore(REDIS_HOST, REDIS_PORT)
+
 
+def _poll_feed(url: str, state=None, verify: bool = True):
+    """Download the feed through the crawler's pooled session and parse it.
 
-def fetch_feed(url, max_items=None):
-    """Fetch RSS feed and parse articles"""
+    Sends the validators from ``state`` and returns ``(response, None)`` when
+    the feed has not changed since that poll.
+    """
+    headers = state.conditional_headers() if state else None
+    response = web_crawler.fetch(url, verify=verify, headers=headers)
+    if state is not None and state.is_unchanged(response.status_code, response.content):
+        return response, None
+    parsed = feedparser.parse(
+        response.content,
+        response_headers={k.lower(): v for k, v in response.headers.items()}
+    )
+    return response, parsed
+
+
+def _entry_guid(entry):
+    return entry.get('id') or entry.get('link', '')
+
+
+def fetch_feed(url, max_items=None, state: FeedState = None, force=False):
+    """Fetch RSS feed and parse articles
+
+    With ``state`` only entries not seen on a previous poll are returned and an
+    unchanged feed (304 or identical body) returns no articles. ``state`` is
+    updated in place; the caller persists it. Links already ingested with full
+    content are skipped. ``force`` ignores the saved state and known links.
+    """
     logger.info(f'Fetching feed: {url}')
-    
-    # Initialize web crawler
-    web_crawler = ArticleCrawler()
+    poll_state = None if force else state
 
-    # First pass: normal parsing
-    parsed = feedparser.parse(url)
+    # First pass: normal fetch + parsing
+    response = None
+    try:
+        response, parsed = _poll_feed(url, poll_state)
+    except requests.RequestException as e:
+        logger.warning(f'Feed fetch failed: {e}')
+        parsed = feedparser.parse(b'')
+
+    if parsed is None:
+        logger.info(f'Feed not modified since last poll: {url}')
+        crawl_metrics["feeds_not_modified"] += 1
+        return []
 
     # Retry path: SSL errors or empty entries
     bozo_exc = getattr(parsed, 'bozo_exception', None)
     retry_needed = parsed.bozo or not parsed.entries
 
     if retry_needed:
-        logger.warning(f'Feed bozo/empty, retrying with UA + relaxed SSL; reason={bozo_exc}')
+        logger.warning(f'Feed bozo/empty, retrying with relaxed SSL; reason={bozo_exc}')
         try:
-            content = _fetch_with_ua(url)
-            parsed = feedparser.parse(content)
-        except URLError as ue:
-            logger.error(f'Fallback fetch failed (URLError): {ue}')
-        except ssl.SSLError as se:
+            response, retry_parsed = _poll_feed(url, poll_state, verify=False)
+            if retry_parsed is None:
+                logger.info(f'Feed not modified since last poll: {url}')
+                crawl_metrics["feeds_not_modified"] += 1
+                return []
+            parsed = retry_parsed
+        except requests.exceptions.SSLError as se:
             logger.error(f'Fallback fetch failed (SSLError): {se}')
+        except requests.RequestException as req_exc:
+            logger.error(f'Fallback fetch failed (RequestException): {req_exc}')
         except Exception as retry_exc:
             logger.error(f'Fallback fetch failed: {retry_exc}')
 
@@ -137,9 +249,14 @@ def fetch_feed(url, max_items=None):
         logger.warning(f'Feed parse bozo: {getattr(parsed, "bozo_exception", None)}')
 
     entries = parsed.entries
+    if poll_state is not None:
+        seen = set(poll_state.seen_guids)
+        entries = [e for e in entries if _entry_guid(e) not in seen]
+        logger.info(f'{len(entries)} of {len(parsed.entries)} feed entries not seen before')
+    all_new_fit = not max_items or len(entries) <= max_items
     if max_items:
         entries = entries[:max_items]
-    
+
     articles = []
     for e in entries:
         title = e.get('title', '').strip()
@@ -184,59 +301,84 @@ def fetch_feed(url, max_items=None):
         if not image_url and summary_images:
             image_url = summary_images[0]
         
-        # Crawl full content from website
-        full_content = summary  # Default to RSS summary
-        if link:
-            logger.info(f'Crawling full content from: {link}')
-            crawled_data = web_crawler.crawl_article(link)
-            if crawled_data and crawled_data.get('success'):
-                full_content = crawled_data.get('content', summary)
-                logger.info(f'✅ Successfully crawled full content ({len(full_content)} chars)')
-                logger.info(f'Content preview: {full_content[:200]}...')
-            else:
-                logger.warning(f'❌ Failed to crawl full content, using RSS summary')
-                logger.warning(f'Crawled data: {crawled_data}')
-
-        # If image_url is still missing, try to extract first image from full content
-        if not image_url and full_content:
-            _, content_images = strip_html_and_extract_images(full_content)
-            if content_images:
-                image_url = content_images[0]
-        
         articles.append({
             'title': title,
             'link': link,
             'published': published,
             'summary': summary,
-            'content': full_content,  # Full HTML content!
+            'content': summary,  # Default to RSS summary until the page is crawled
             'image_url': image_url
         })
-    
+    guids = {id(article): _entry_guid(e) for article, e in zip(articles, entries)}
+    # Entries with nothing left to crawl; a failed crawl stays unseen so the next poll retries it
+    done_guids = [guids[id(article)] for article in articles if not article['link']]
+
+    # Skip links that are already ingested with full content
+    if not force:
+        known = find_ingested_links([article['link'] for article in articles if article['link']])
+        if known:
+            done_guids.extend(guids[id(article)] for article in articles if article['link'] in known)
+            articles = [article for article in articles if article['link'] not in known]
+            crawl_metrics["skipped_known"] += len(known)
+            logger.info(f'Skipping {len(known)} already ingested articles')
+
+    # Crawl full content from website (concurrently, results keep entry order)
+    to_crawl = [article for article in articles if article['link']]
+    logger.info(f'Crawling full content for {len(to_crawl)} articles')
+    crawled_results = web_crawler.crawl_many([article['link'] for article in to_crawl])
+    if to_crawl:
+        memory = web_crawler.last_crawl_memory
+        logger.info(f'Article downloads buffered at most {memory["peak_buffered_bytes"]} bytes '
+                    f'(process max RSS {memory["max_rss_kb"]} KB)')
+
+    crawl_failed = False
+    for article, crawled_data in zip(to_crawl, crawled_results):
+        if crawled_data and crawled_data.get('success'):
+            article['content'] = crawled_data.get('content', article['summary'])  # Full HTML content!
+            done_guids.append(guids[id(article)])
+            logger.info(f'✅ Successfully crawled full content ({len(article["content"])} chars): {article["link"]}')
+        else:
+            crawl_failed = True
+            logger.warning(f'❌ Failed to crawl full content, using RSS summary: {article["link"]}')
+
+    if state is not None:
+        # Keep old validators while new entries remain beyond max_items or a page
+        # failed to crawl, so the next poll downloads the feed again and retries them
+        if (response is not None and response.status_code == 200 and parsed.entries
+                and all_new_fit and not crawl_failed):
+            state.update_validators(response.headers, response.content)
+        done = set(done_guids)
+        state.remember(guid for guid in (_entry_guid(e) for e in entries) if guid in done)
+
+    # If image_url is still missing, try to extract first image from full content
+    for article in articles:
+        if not article['image_url'] and article['content']:
+            _, content_images = strip_html_and_extract_images(article['content'])
+            if content_images:
+                article['image_url'] = content_images[0]
+
     return articles
 
-def publish_crawled_data(article_data):
-    """Publish crawled article to crawled_data queue"""
-    try:
+_publisher = None
+
+
+def get_publisher():
+    """Publisher owned by the consumer thread, created on first use"""
+    global _publisher
+    if _publisher is None:
         credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASSWORD)
-        connection = pika.BlockingConnection(
-            pika.ConnectionParameters(host=RABBITMQ_HOST, port=RABBITMQ_PORT, credentials=credentials)
+        _publisher = CrawledDataPublisher(
+            pika.ConnectionParameters(
+                host=RABBITMQ_HOST,
+                port=RABBITMQ_PORT,
+                credentials=credentials,
+                heartbeat=600,
+                blocked_connection_timeout=300
+            ),
+            queue='crawled_data',
+            batch_size=PUBLISH_BATCH_SIZE
         )
-        channel = connection.channel()
-        channel.queue_declare(queue='crawled_data', durable=True)
-        
-        message = json.dumps(article_data)
-        channel.basic_publish(
-            exchange='',
-            routing_key='crawled_data',
-            body=message,
-            properties=pika.BasicProperties(delivery_mode=2)
-        )
-        connection.close()
-        logger.info(f'Published article: {article_data.get("title")}')
-        return True
-    except Exception as e:
-        logger.error(f'Failed to publish to RabbitMQ: {e}')
-        return False
+    return _publisher
 
 def process_crawl_task(ch, method, properties, body):
     """Process crawl task from RabbitMQ"""
@@ -252,19 +394,21 @@ def process_crawl_task(ch, method, properties, body):
             ch.basic_ack(delivery_tag=method.delivery_tag)
             return
         
-        # Fetch articles from RSS feed
-        articles = fetch_feed(url, max_items=50)
+        # Fetch articles from RSS feed (only new entries unless forced)
+        state = feed_states.load(url)
+        articles = fetch_feed(url, max_items=50, state=state, force=bool(task.get('force')))
         
-        new_count = 0
         for article in articles:
             article['source_id'] = source_id
-            
-            # Publish to crawled_data queue
-            if publish_crawled_data(article):
-                new_count += 1
-                crawl_metrics["total_new"] += 1
-            
-            crawl_metrics["total_crawled"] += 1
+
+        # Publish to crawled_data queue over the worker's long-lived channel
+        new_count = get_publisher().publish_batch(articles)
+        crawl_metrics["total_new"] += new_count
+        crawl_metrics["total_crawled"] += len(articles)
+
+        # Only remember this poll once every article reached the queue
+        if new_count == len(articles):
+            feed_states.save(url, state)
         
         crawl_metrics["last_crawl"] = time.strftime('%Y-%m-%d %H:%M:%S')
         
@@ -314,6 +458,10 @@ def start_background_worker():
 def startup_event():
     start_background_worker()
 
+@app.on_event("shutdown")
+def shutdown_event():
+    web_crawler.close()
+
 if __name__ == '__main__':
     # Start FastAPI server
     uvicorn.run(app, host='0.0.0.0', port=8003)
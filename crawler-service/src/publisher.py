@@ -0,0 +1,114 @@
+"""
+Long-lived RabbitMQ publisher for the crawled_data queue.
+Keeps one connection/channel per worker and commits messages in batches.
+"""
+
+import json
+import logging
+import time
+from typing import Dict, List, Optional
+
+import pika
+from pika.exceptions import AMQPError
+
+logger = logging.getLogger(__name__)
+
+
+class CrawledDataPublisher:
+    """Reusable publisher; not thread-safe, use one instance per worker thread."""
+
+    def __init__(self, parameters: pika.ConnectionParameters, queue: str = 'crawled_data', batch_size: int = 50):
+        self.parameters = parameters
+        self.queue = queue
+        self.batch_size = max(1, batch_size)
+        self._connection: Optional[pika.BlockingConnection] = None
+        self._channel = None
+        self._connected_once = False
+        self.stats = {
+            "published": 0,
+            "failed": 0,
+            "batches": 0,
+            "reconnects": 0,
+            "publish_seconds": 0.0,
+            "last_batch_rate": None,
+        }
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    def _ensure_channel(self):
+        if self._channel is not None and self._channel.is_open and self._connection.is_open:
+            # Service heartbeats that piled up while the worker was idle
+            self._connection.process_data_events(time_limit=0)
+            return self._channel
+
+        self._reset()
+        if self._connected_once:
+            self.stats["reconnects"] += 1
+        self._connection = pika.BlockingConnection(self.parameters)
+        self._connected_once = True
+        self._channel = self._connection.channel()
+        self._channel.queue_declare(queue=self.queue, durable=True)
+        # Transactions give one broker round trip per batch instead of one per message
+        self._channel.tx_select()
+        return self._channel
+
+    def _reset(self):
+        try:
+            if self._connection is not None and self._connection.is_open:
+                self._connection.close()
+        except AMQPError:
+            pass
+        self._connection = None
+        self._channel = None
+
+    def close(self):
+        self._reset()
+
+    # ------------------------------------------------------------------
+    # Publishing
+    def _publish_chunk(self, bodies: List[bytes]) -> None:
+        channel = self._ensure_channel()
+        for body in bodies:
+            channel.basic_publish(
+                exchange='',
+                routing_key=self.queue,
+                body=body,
+                properties=pika.BasicProperties(delivery_mode=2)
+            )
+        channel.tx_commit()
+
+    def publish_batch(self, messages: List[Dict]) -> int:
+        """Publish messages durably; returns how many the broker accepted.
+
+        Each chunk of ``batch_size`` messages is committed atomically. A chunk
+        that fails is retried once on a fresh connection.
+        """
+        published = 0
+        started = time.perf_counter()
+        for i in range(0, len(messages), self.batch_size):
+            chunk = messages[i:i + self.batch_size]
+            bodies = [json.dumps(m).encode('utf-8') for m in chunk]
+            for attempt in (1, 2):
+                try:
+                    self._publish_chunk(bodies)
+                    published += len(bodies)
+                    break
+                except AMQPError as e:
+                    logger.warning(f'Publish to {self.queue} failed (attempt {attempt}): {e!r}')
+                    self._reset()
+            else:
+                self.stats["failed"] += len(bodies)
+                logger.error(f'Dropped {len(bodies)} messages for {self.queue} after reconnect')
+            self.stats["batches"] += 1
+
+        elapsed = time.perf_counter() - started
+        self.stats["published"] += published
+        self.stats["publish_seconds"] += elapsed
+        if published and elapsed > 0:
+            self.stats["last_batch_rate"] = round(published / elapsed, 1)
+        return published
+
+    def messages_per_second(self) -> Optional[float]:
+        if not self.stats["publish_seconds"]:
+            return None
+        return round(self.stats["published"] / self.stats["publish_seconds"], 1)
@@ -4,22 +4,316 @@ Collects full article content (text + images) from Vietnamese news sites.
 """
 
 import logging
+import multiprocessing
 import re
-from typing import Dict, List, Optional
-from urllib.parse import urljoin
+import resource
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Union
+from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, FeatureNotFound, NavigableString, Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from charsets import CharsetCache, PageDecoder
+from extraction_profiles import ProfileStats, profile_for_url
 
 logger = logging.getLogger(__name__)
 
+# BeautifulSoup tree builders ArticleCrawler accepts: lxml is the fast C parser,
+# html.parser is pure Python and always available, html5lib parses like a browser
+HTML_PARSERS = ('lxml', 'html.parser', 'html5lib')
+
+
+def resolve_parser(name: str) -> str:
+    """Return ``name`` if its tree builder is installed, else fall back to html.parser."""
+    if name not in HTML_PARSERS:
+        raise ValueError(f"Unknown HTML parser {name!r}, expected one of {HTML_PARSERS}")
+    try:
+        BeautifulSoup('', name)
+    except FeatureNotFound:
+        logger.warning(f"HTML parser {name!r} is not installed, falling back to html.parser")
+        return 'html.parser'
+    return name
+
+# Generic body container cascade for hosts without an extraction profile
+GENERIC_BODY_SELECTORS = (
+    ('article', {}),
+    # ThanhNien specific classes
+    ('div', {'class': re.compile(r'detail-content|detail__main|detail__cmain-main|detail__cmain|afcbc-body', re.I)}),
+    # VNExpress selectors (broadened)
+    ('div', {'class': re.compile(r'fck_detail|content_detail|detail__content|read__content|main-detail|container_detail|content-detail|section-content|article-content|section-content', re.I)}),
+    ('section', {'class': re.compile(r'section-content|article-content', re.I)}),
+    ('div', {'class': re.compile(r'article-body|article__body|story-body|post-content|entry-content|main-content|post', re.I)}),
+    ('div', {'id': re.compile(r'article|content|detail|body', re.I)}),
+    ('main', {}),
+    ('div', {'class': re.compile(r'article|content|detail|body|main-content|post', re.I)}),
+)
+
+# ----------------------------------------------------------------------
+# DOM cleaning rules, compiled once
+DROP_TAGS = frozenset(['script', 'style', 'noscript'])
+# Header/footer/navigation/metadata (ThanhNien)
+DROP_CLASS_RE = re.compile(r'breadcrumb|header|footer|nav|author|time|date|share|social|comment|relate|sidebar|widget|tool|tag|category-label|detail-tab', re.I)
+DROP_ID_RE = re.compile(r'header|footer|nav|sidebar|comment|relate', re.I)
+# Related-topic/tag blocks recognised by their text (e.g., "Khám phá thêm chủ đề")
+TOPIC_TEXT_TAGS = frozenset(['div', 'section', 'aside', 'ul', 'ol', 'p'])
+TOPIC_TEXT_PATTERNS = (
+    'khám phá thêm', 'chủ đề', 'từ khóa', 'tin liên quan',
+    'cùng chuyên mục', 'đọc thêm', 'có thể bạn quan tâm',
+    'dòng sự kiện', 'detail info=', 'siteid185', 'threadid',
+    'tin đọc nhiều', 'for inquiries'
+)
+# ThanhNien tag/highlight blocks (only dropped when their text is a tag/related section)
+TOPIC_BLOCK_CLASS_RE = re.compile(r'detail__cmain-flex|detail-tab|tag-title|highlight', re.I)
+AD_TAGS = frozenset(['div', 'section'])
+AD_RE = re.compile(r'(\b(ad|ads|advertisement|sponsor|taboola|outbrain|banner)\b)', re.I)
+TAGS_ROLE_ATTRS = ('data-role', 'role', 'data-component', 'data-widget')
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+# Script residue that marks a text node as JavaScript/ad code on its own
+JS_BLOCKLIST = (
+    'taboola', 'outbrain', 'arfasync', 'mutexads', '_taboola', 'runinit', '_mgq',
+    'window.runinit', 'window.pagesettings', 'window._isadshidden',
+    'document.queryselector', 'document.createelement',
+    'addeventlistener', '.push(', '.call(', 'htmltoelement',
+)
+# JS syntax markers; text containing two different ones is treated as code
+JS_PATTERNS = (
+    'function(', 'function ()', 'document.createelement', 'document.queryselector',
+    '.appendchild', '.insertbefore', 'var ', 'const ', 'let ',
+    '.getattribute', '.setattribute', 'typeof ', 'typeof window',
+)
+
+
+def _alternation(keywords):
+    """One compiled regex matching any keyword literally, longest keyword first."""
+    return re.compile('|'.join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True)))
+
+
+JS_BLOCKLIST_RE = _alternation(JS_BLOCKLIST)
+JS_PATTERN_RE = _alternation(JS_PATTERNS)
+
+
+# Bit flags for the class-based rules
+RULE_DROP = 1
+RULE_TOPIC_BLOCK = 2
+RULE_AD = 4
+
+
+@lru_cache(maxsize=4096)
+def _class_token_rules(token: str) -> int:
+    """Rules matched by a single class token (tokens repeat a lot across pages)."""
+    rules = 0
+    if DROP_CLASS_RE.search(token):
+        rules |= RULE_DROP
+    if TOPIC_BLOCK_CLASS_RE.search(token):
+        rules |= RULE_TOPIC_BLOCK
+    if AD_RE.search(token):
+        rules |= RULE_AD
+    return rules
+
+
+def _class_rules(value) -> int:
+    if not value:
+        return 0
+    if isinstance(value, str):
+        value = [value]
+    rules = 0
+    for token in value:
+        rules |= _class_token_rules(token)
+    return rules
+
+
+def _spans_containing(strings: List[str], spans: List[tuple], patterns) -> List[bool]:
+    """For each ``(first, end)`` range, whether ' '.join(strings[first:end]) contains a pattern.
+
+    Every element's text is a slice of one document-wide string, so the
+    patterns are located once and each element costs a bisect instead of
+    re-extracting its text (which is quadratic on nested containers).
+    """
+    offsets = []
+    pos = 0
+    for text in strings:
+        offsets.append(pos)
+        pos += len(text) + 1
+    document = ' '.join(strings)
+
+    hits = []
+    for pattern in patterns:
+        start = document.find(pattern)
+        while start != -1:
+            hits.append((start, start + len(pattern)))
+            start = document.find(pattern, start + 1)
+    if not hits:
+        return [False] * len(spans)
+    hits.sort()
+    starts = [h[0] for h in hits]
+    # Earliest hit end among hits starting at or after index i
+    min_end = [0] * len(hits)
+    current = None
+    for i in range(len(hits) - 1, -1, -1):
+        current = hits[i][1] if current is None else min(current, hits[i][1])
+        min_end[i] = current
+
+    result = []
+    for first, end in spans:
+        if first >= end:
+            result.append(False)
+            continue
+        text_start = offsets[first]
+        text_end = offsets[end - 1] + len(strings[end - 1])
+        i = bisect_left(starts, text_start)
+        result.append(i < len(hits) and min_end[i] <= text_end)
+    return result
+
+
+# Content types worth parsing as an article page (missing Content-Type is allowed too)
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class DownloadRejected(Exception):
+    """Article page not downloaded: wrong content type or body over the size cap."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+# Crawler instance used inside extraction worker processes (see crawl_many)
+_worker_crawler = None
+
+
+def _init_extract_worker(parser: str) -> None:
+    global _worker_crawler
+    _worker_crawler = ArticleCrawler(parser=parser)
+
+
+def _extract_in_worker(html: bytes, url: str):
+    """Run extraction in a pool process; returns (content, profile stats for this page)."""
+    _worker_crawler.profile_stats = ProfileStats()
+    content = _worker_crawler.extract_content(html, url)
+    return content, _worker_crawler.profile_stats.snapshot()
+
 
 class ArticleCrawler:
-    def __init__(self, timeout: int = 15):
+    def __init__(self, timeout: int = 15, max_workers: int = 8, max_per_host: int = 4,
+                 retries: int = 2, backoff_factor: float = 0.5, parser: str = 'html.parser',
+                 extract_workers: int = 0, max_body_bytes: int = 5 * 1024 * 1024):
         self.timeout = timeout
+        # Article pages larger than this are abandoned mid-download
+        self.max_body_bytes = max_body_bytes
+        self.parser = resolve_parser(parser)
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121 Safari/537.36',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+        # Concurrency limits for crawl_many: total in-flight pages and pages per hostname
+        self.max_workers = max(1, max_workers)
+        self.max_per_host = max(1, max_per_host)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+        self.profile_stats = ProfileStats()
+        # Processes for parsing/cleaning in crawl_many; 0 extracts on the download threads
+        self.extract_workers = max(0, extract_workers)
+        self._extract_pool: Optional[ProcessPoolExecutor] = None
+        self._extract_pool_lock = threading.Lock()
+        # Page bodies currently held by download threads, and the peak per crawl_many call
+        self._buffered_lock = threading.Lock()
+        self._buffered_bytes = 0
+        self._buffered_peak = 0
+        self.download_stats = {
+            'rejected_too_large': 0, 'rejected_content_type': 0, 'largest_page_bytes': 0, 'charset_sources': {},
         }
+        self.charset_cache = CharsetCache()
+        self.last_crawl_memory: Optional[Dict] = None
+        self.session = self._build_session(retries, backoff_factor)
+
+    def _build_session(self, retries: int, backoff_factor: float) -> requests.Session:
+        """Long-lived keep-alive session shared by feed and article fetches."""
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+        )
+        # One connection pool per host, sized so every per-host slot keeps its socket alive
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=self.max_per_host, max_retries=retry)
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def fetch(self, url: str, verify: bool = True, headers: Optional[Dict] = None) -> requests.Response:
+        """GET through the pooled session (raises on HTTP errors)."""
+        response = self.session.get(url, timeout=self.timeout, verify=verify, headers=headers)
+        response.raise_for_status()
+        return response
+
+    def download(self, url: str) -> Union[bytes, str]:
+        """Stream an article page, stopping early on non-HTML or oversized bodies.
+
+        The body is decoded once as it streams in (see charsets.PageDecoder) and
+        returned as text; only pages with no usable charset anywhere come back
+        as bytes for BeautifulSoup to sniff. Raises DownloadRejected.
+        """
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            mime = content_type.split(';', 1)[0].strip().lower()
+            if mime and mime not in HTML_CONTENT_TYPES:
+                self._count_rejected('rejected_content_type')
+                raise DownloadRejected('content_type', f'Not an HTML page ({mime}): {url}')
+
+            declared = response.headers.get('Content-Length', '')
+            if declared.isdigit() and int(declared) > self.max_body_bytes:
+                self._count_rejected('rejected_too_large')
+                raise DownloadRejected('too_large', f'Page is {declared} bytes (cap {self.max_body_bytes}): {url}')
+
+            decoder = PageDecoder(content_type, (urlparse(url).hostname or '').lower(), self.charset_cache)
+            size = 0
+            try:
+                # Content-Length is the compressed size (or absent), so cap the decoded stream too
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    self._track_buffered(len(chunk))
+                    if size > self.max_body_bytes:
+                        self._count_rejected('rejected_too_large')
+                        raise DownloadRejected('too_large', f'Page exceeds {self.max_body_bytes} bytes: {url}')
+                    decoder.feed(chunk)
+                page = decoder.finish()
+            finally:
+                self._track_buffered(-size)
+
+        with self._buffered_lock:
+            self.download_stats['largest_page_bytes'] = max(self.download_stats['largest_page_bytes'], size)
+            sources = self.download_stats['charset_sources']
+            sources[decoder.source] = sources.get(decoder.source, 0) + 1
+        return page
+
+    def _track_buffered(self, delta: int) -> None:
+        with self._buffered_lock:
+            self._buffered_bytes += delta
+            self._buffered_peak = max(self._buffered_peak, self._buffered_bytes)
+
+    def _count_rejected(self, key: str) -> None:
+        with self._buffered_lock:
+            self.download_stats[key] += 1
+
+    def close(self) -> None:
+        self.session.close()
+        if self._extract_pool is not None:
+            self._extract_pool.shutdown(wait=False, cancel_futures=True)
+            self._extract_pool = None
 
     # ------------------------------------------------------------------
     # Helpers
@@ -34,21 +328,16 @@ class ArticleCrawler:
 
         text_lower = text.lower()
 
-        absolute_blocklist = [
-            'taboola', 'outbrain', 'arfasync', 'mutexads', '_taboola', 'runinit', '_mgq',
-            'window.runinit', 'window.pagesettings', 'window._isadshidden',
-            'document.queryselector', 'document.createelement',
-            'addeventlistener', '.push(', '.call(', 'htmltoelement',
-        ]
-        if any(k in text_lower for k in absolute_blocklist):
+        if JS_BLOCKLIST_RE.search(text_lower):
             return True
 
-        js_patterns = [
-            'function(', 'function ()', 'document.createelement', 'document.queryselector',
-            '.appendchild', '.insertbefore', 'var ', 'const ', 'let ',
-            '.getattribute', '.setattribute', 'typeof ', 'typeof window',
-        ]
-        if sum(1 for p in js_patterns if p in text_lower) >= 2:
+        # Two or more distinct JS markers. One regex scan finds every marker that
+        # does not overlap an earlier match; only when exactly one kind shows up
+        # can an overlapped second marker hide, so confirm with substring checks.
+        found = set(JS_PATTERN_RE.findall(text_lower))
+        if len(found) >= 2:
+            return True
+        if found and sum(1 for p in JS_PATTERNS if p in text_lower) >= 2:
             return True
 
         if text_lower.startswith(('//', '/*', '(function')):
@@ -57,66 +346,109 @@ class ArticleCrawler:
             return True
         return False
 
+    # ------------------------------------------------------------------
+    # DOM cleaning
+    def _clean_container(self, container) -> None:
+        """Remove scripts, navigation, metadata, related-topic and ad blocks in place.
+
+        One traversal collects every element with its text range; each rule is
+        then decided once per node and only the topmost dropped nodes are
+        decomposed. Text rules see the tree as it is after the tag/class/id
+        rules, and the ThanhNien block rule sees it after the topic rule.
+        """
+        strings: List[str] = []
+        # [tag, first_string, end_string, end_element, class_rules] in document order
+        elements: List[list] = []
+        dropped: List[Tag] = []
+
+        def visit(node):
+            for child in node.contents:
+                if isinstance(child, Tag):
+                    attrs = child.attrs
+                    rules = _class_rules(attrs.get('class'))
+                    element_id = attrs.get('id')
+                    if (rules & RULE_DROP or child.name in DROP_TAGS
+                            or (element_id and DROP_ID_RE.search(element_id))):
+                        dropped.append(child)
+                        continue
+                    entry = [child, len(strings), 0, 0, rules]
+                    elements.append(entry)
+                    visit(child)
+                    entry[2] = len(strings)
+                    entry[3] = len(elements)
+                elif type(child) in TEXT_STRING_TYPES:
+                    text = child.strip()
+                    if text:
+                        strings.append(text.lower())
+
+        visit(container)
+
+        # Related-topic blocks by text
+        topic = [False] * len(elements)
+        candidates = [i for i, e in enumerate(elements) if e[0].name in TOPIC_TEXT_TAGS]
+        matches = _spans_containing(strings, [(elements[i][1], elements[i][2]) for i in candidates], TOPIC_TEXT_PATTERNS)
+        skip_until = 0
+        for i, matched in zip(candidates, matches):
+            if i >= skip_until and matched:
+                topic[i] = True
+                skip_until = elements[i][3]
+
+        # ThanhNien tag/highlight blocks, judged on the text left after the topic rule
+        blocks = [i for i, e in enumerate(elements) if e[4] & RULE_TOPIC_BLOCK]
+        if blocks:
+            kept_prefix = [0]
+            removed_until = 0
+            string_kept = [True] * len(strings)
+            for i, e in enumerate(elements):
+                if topic[i] and i >= removed_until:
+                    removed_until = e[3]
+                    for k in range(e[1], e[2]):
+                        string_kept[k] = False
+            for kept in string_kept:
+                kept_prefix.append(kept_prefix[-1] + kept)
+            remaining = [t for t, kept in zip(strings, string_kept) if kept]
+            spans = [(kept_prefix[elements[i][1]], kept_prefix[elements[i][2]]) for i in blocks]
+            for i, matched in zip(blocks, _spans_containing(remaining, spans, TOPIC_TEXT_PATTERNS)):
+                if matched:
+                    topic[i] = True
+
+        # Decide once per node, decompose only the topmost dropped elements
+        i = 0
+        while i < len(elements):
+            tag, _, _, end_element, rules = elements[i]
+            if topic[i] or self._is_ad_or_tags_block(tag, rules):
+                dropped.append(tag)
+                i = end_element
+            else:
+                i += 1
+
+        for tag in dropped:
+            tag.decompose()
+
+    def _is_ad_or_tags_block(self, tag: Tag, class_rules: int) -> bool:
+        attrs = tag.attrs
+        # Obvious ad blocks
+        if tag.name in AD_TAGS:
+            element_id = attrs.get('id')
+            if class_rules & RULE_AD or (element_id and AD_RE.search(element_id)):
+                return True
+        # Tag lists marked by attributes (e.g., data-role="tags")
+        for attr_name in TAGS_ROLE_ATTRS:
+            attr_val = attrs.get(attr_name)
+            if attr_val is None:
+                continue
+            if isinstance(attr_val, list):
+                attr_val = ' '.join(map(str, attr_val))
+            if 'tags' in str(attr_val).lower():
+                return True
+        return False
+
     # ------------------------------------------------------------------
     # Content collection
     def _collect_paragraphs_with_images(self, container, page_url: str, p_selector: Optional[Dict] = None) -> str:
         """Traverse DOM depth-first to preserve text+image order (VNExpress, ThanhNien)."""
 
-        # Remove unwanted elements globally (keep iframes for potential video)
-        for unwanted in container.find_all(['script', 'style', 'noscript']):
-            unwanted.decompose()
-
-        # Remove header/footer/navigation/metadata for ThanhNien
-        for unwanted_class in container.find_all(class_=re.compile(r'breadcrumb|header|footer|nav|author|time|date|share|social|comment|relate|sidebar|widget|tool|tag|category-label|detail-tab', re.I)):
-            unwanted_class.decompose()
-        
-        # Remove by ID
-        for unwanted_id in container.find_all(id=re.compile(r'header|footer|nav|sidebar|comment|relate', re.I)):
-            unwanted_id.decompose()
-
-        # Remove related-topic/tag blocks by text (e.g., "Khám phá thêm chủ đề")
-        topic_text_patterns = [
-            'khám phá thêm', 'chủ đề', 'từ khóa', 'tin liên quan',
-            'cùng chuyên mục', 'đọc thêm', 'có thể bạn quan tâm',
-            'dòng sự kiện', 'detail info=', 'siteid185', 'threadid',
-            'tin đọc nhiều', 'for inquiries'
-        ]
-        for section in container.find_all(['div', 'section', 'aside', 'ul', 'ol', 'p']):
-            text = section.get_text(separator=' ', strip=True).lower()
-            if text and any(pat in text for pat in topic_text_patterns):
-                section.decompose()
-
-        # Remove ThanhNien tag/highlight blocks (only when they are tag/related sections)
-        for block in container.find_all(class_=re.compile(r'detail__cmain-flex|detail-tab|tag-title|highlight', re.I)):
-            text = block.get_text(separator=' ', strip=True).lower()
-            if any(pat in text for pat in topic_text_patterns):
-                block.decompose()
-
-        # Remove obvious ad blocks
-        ads_selectors = [
-            {'class': re.compile(r'(\b(ad|ads|advertisement|sponsor|taboola|outbrain|banner)\b)', re.I)},
-            {'id': re.compile(r'(\b(ad|ads|advertisement|sponsor|taboola|outbrain|banner)\b)', re.I)},
-        ]
-        for selector in ads_selectors:
-            for ad in container.find_all(['div', 'section'], selector):
-                ad.decompose()
-
-        # Remove by attributes (e.g., data-role="tags")
-        for section in container.find_all(True):
-            for attr_name, attr_val in section.attrs.items():
-                if isinstance(attr_val, list):
-                    attr_val_join = ' '.join(map(str, attr_val)).lower()
-                else:
-                    attr_val_join = str(attr_val).lower()
-                if attr_name in ['data-role', 'role', 'data-component', 'data-widget'] and 'tags' in attr_val_join:
-                    section.decompose()
-                    break
-
-        # Inline scripts with ad keywords
-        for script in container.find_all('script'):
-            script_text = script.get_text(strip=True).lower()
-            if any(k in script_text for k in ['taboola', 'outbrain', 'mutexads', 'runinit', '_mgq', '_taboola']):
-                script.decompose()
+        self._clean_container(container)
 
         content_parts: List[str] = []
         video_providers = ['youtube.com', 'youtu.be', 'vimeo.com', 'player.vcdn.vn', 'video.thanhnien.vn', 'vnecdn']
@@ -284,53 +616,228 @@ class ArticleCrawler:
                         content_parts.append(f'<p>{line}</p>')
 
         return '\n'.join(content_parts)
+    def _find_article_body(self, soup, url: str = ''):
+        profile = profile_for_url(url)
+        if profile is not None:
+            article_body = profile.find_body(soup)
+            self.profile_stats.record(profile.name, article_body is not None)
+            if article_body is not None:
+                return article_body
+
+        # Try common article selectors (broad but ordered)
+        for name, attrs in GENERIC_BODY_SELECTORS:
+            article_body = soup.find(name, attrs)
+            if article_body:
+                if profile is None:
+                    self.profile_stats.record('generic', True)
+                return article_body
+
+        if profile is None:
+            self.profile_stats.record('generic', False)
+        # Fallback: choose the div with the most text
+        return self._largest_text_div(soup)
+
+    def _largest_text_div(self, soup):
+        """First div (document order) with the longest stripped text, in one traversal."""
+        best = None
+        best_size = -1
+        best_order = 0
+        order = 0
+
+        def visit(node) -> int:
+            nonlocal best, best_size, best_order, order
+            order += 1
+            my_order = order
+            size = 0
+            for child in node.contents:
+                if isinstance(child, Tag):
+                    size += visit(child)
+                elif type(child) in TEXT_STRING_TYPES:
+                    size += len(child.strip())
+            if node.name == 'div' and (size > best_size or (size == best_size and my_order < best_order)):
+                best, best_size, best_order = node, size, my_order
+            return size
+
+        for child in soup.contents:
+            if isinstance(child, Tag):
+                visit(child)
+        return best
+
+    def extract_content(self, html, url: str) -> Optional[str]:
+        """Parse a downloaded page and return the cleaned article HTML (no network)."""
+        soup = BeautifulSoup(html, self.parser)
+        article_body = self._find_article_body(soup, url)
+        if not article_body:
+            logger.warning(f"Could not find article body for {url}")
+            return None
+        return self._collect_paragraphs_with_images(article_body, url)
+
     def crawl_generic(self, url: str) -> Optional[Dict]:
         """Generic crawler for unknown sites"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.encoding = 'utf-8'
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Try common article selectors (broad but ordered)
-            article_body = (
-                soup.find('article') or
-                # ThanhNien specific classes
-                soup.find('div', class_=re.compile(r'detail-content|detail__main|detail__cmain-main|detail__cmain|afcbc-body', re.I)) or
-                # VNExpress selectors (broadened)
-                soup.find('div', class_=re.compile(r'fck_detail|content_detail|detail__content|read__content|main-detail|container_detail|content-detail|section-content|article-content|section-content', re.I)) or
-                soup.find('section', class_=re.compile(r'section-content|article-content', re.I)) or
-                soup.find('div', class_=re.compile(r'article-body|article__body|story-body|post-content|entry-content|main-content|post', re.I)) or
-                soup.find('div', id=re.compile(r'article|content|detail|body', re.I)) or
-                soup.find('main') or
-                soup.find('div', class_=re.compile(r'article|content|detail|body|main-content|post', re.I))
-            )
-
-            # Fallback: choose the div with the most text
-            if not article_body:
-                divs = soup.find_all('div')
-                if divs:
-                    article_body = max(divs, key=lambda d: len(d.get_text(strip=True)))
-            
-            if not article_body:
-
-                logger.warning(f"Could not find article body for {url}")
-                return None
-            
-            content_html = self._collect_paragraphs_with_images(article_body, url)
-            
-            # Accept content as long as it's non-empty. Some sources have short bodies.
-            if content_html and len(content_html.strip()) > 0:
-                return {
-                    'content': content_html,
-                    'success': True
-                }
-            
+            return self._as_result(self.extract_content(self.download(url), url))
+        except DownloadRejected as e:
+            logger.warning(f"Skipped {url}: {e}")
             return None
         except Exception as e:
             logger.error(f"Error crawling generic {url}: {e}")
             return None
+
+    @staticmethod
+    def _as_result(content_html: Optional[str]) -> Optional[Dict]:
+        # Accept content as long as it's non-empty. Some sources have short bodies.
+        if content_html and len(content_html.strip()) > 0:
+            return {
+                'content': content_html,
+                'success': True
+            }
+        return None
     
     def crawl_article(self, url: str) -> Optional[Dict]:
         """Universal entry point - currently all domains use the generic crawler"""
         logger.info(f"Crawling article: {url}")
         return self.crawl_generic(url)
+
+    # ------------------------------------------------------------------
+    # Concurrent crawling
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = (urlparse(url).hostname or '').lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _crawl_with_host_limit(self, url: str) -> Optional[Dict]:
+        with self._host_slot(url):
+            try:
+                return self.crawl_article(url)
+            except Exception as e:
+                logger.error(f"Error crawling {url}: {e}")
+                return None
+
+    def _download_with_host_limit(self, url: str) -> Optional[Union[str, bytes]]:
+        with self._host_slot(url):
+            logger.info(f"Crawling article: {url}")
+            try:
+                return self.download(url)
+            except DownloadRejected as e:
+                logger.warning(f"Skipped {url}: {e}")
+                return None
+            except Exception as e:
+                logger.error(f"Error downloading {url}: {e}")
+                return None
+
+    def _extraction_pool(self) -> ProcessPoolExecutor:
+        with self._extract_pool_lock:
+            if self._extract_pool is None:
+                # spawn: the service forks from a process that already runs consumer threads
+                self._extract_pool = ProcessPoolExecutor(
+                    max_workers=self.extract_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_extract_worker,
+                    initargs=(self.parser,),
+                )
+            return self._extract_pool
+
+    def crawl_many(self, urls: List[str]) -> List[Optional[Dict]]:
+        """Crawl several articles concurrently.
+
+        At most ``max_workers`` pages are downloaded at once and at most
+        ``max_per_host`` per hostname. With ``extract_workers`` set, each page
+        is parsed in a process pool as soon as its download finishes, so
+        extraction uses every core while the threads stay on network I/O.
+        Results keep the order of ``urls``.
+        """
+        if not urls:
+            return []
+
+        # Interleave hosts so workers are not all parked on one host's limit
+        seen_per_host: Dict[str, int] = {}
+        rank = []
+        for url in urls:
+            host = (urlparse(url).hostname or '').lower()
+            rank.append(seen_per_host.get(host, 0))
+            seen_per_host[host] = rank[-1] + 1
+        schedule = sorted(range(len(urls)), key=lambda i: rank[i])
+
+        with self._buffered_lock:
+            self._buffered_peak = self._buffered_bytes
+        workers = min(self.max_workers, len(urls))
+        if self.extract_workers:
+            results = self._crawl_pipelined(urls, schedule, workers)
+        else:
+            results = self._crawl_inline(urls, schedule, workers)
+
+        with self._buffered_lock:
+            self.last_crawl_memory = {
+                'pages': len(urls),
+                'peak_buffered_bytes': self._buffered_peak,
+                # Process-wide high-water mark (kilobytes on Linux)
+                'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            }
+        return results
+
+    def _crawl_inline(self, urls: List[str], schedule: List[int], workers: int) -> List[Optional[Dict]]:
+        results: List[Optional[Dict]] = [None] * len(urls)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='article-crawl') as pool:
+            futures = {i: pool.submit(self._crawl_with_host_limit, urls[i]) for i in schedule}
+            for i, future in futures.items():
+                results[i] = future.result()
+        return results
+
+    def _drop_broken_pool(self, pool: Optional[ProcessPoolExecutor]) -> None:
+        """Discard a pool whose worker died so the next crawl_many starts a fresh one."""
+        if pool is None:
+            return
+        logger.error("Extraction worker died, extracting the rest of this batch inline")
+        with self._extract_pool_lock:
+            if self._extract_pool is pool:
+                self._extract_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _extract_inline(self, html, url: str) -> Optional[Dict]:
+        try:
+            return self._as_result(self.extract_content(html, url))
+        except Exception as e:
+            logger.error(f"Error extracting {url}: {e}")
+            return None
+
+    def _crawl_pipelined(self, urls: List[str], schedule: List[int], workers: int) -> List[Optional[Dict]]:
+        results: List[Optional[Dict]] = [None] * len(urls)
+        extract_pool = self._extraction_pool()
+        # Downloaded pages, kept so a dead pool's pages can still be extracted here
+        pages = {}
+        extractions = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='article-download') as pool:
+            downloads = {pool.submit(self._download_with_host_limit, urls[i]): i for i in schedule}
+            for future in as_completed(downloads):
+                i = downloads[future]
+                html = future.result()
+                if html is None:
+                    continue
+                pages[i] = html
+                if extract_pool is None:
+                    continue
+                try:
+                    extractions[i] = extract_pool.submit(_extract_in_worker, html, urls[i])
+                except BrokenProcessPool:
+                    self._drop_broken_pool(extract_pool)
+                    extract_pool = None
+        for i, html in pages.items():
+            if i in extractions:
+                try:
+                    content_html, stats = extractions[i].result()
+                except BrokenProcessPool:
+                    self._drop_broken_pool(extract_pool)
+                    extract_pool = None
+                except Exception as e:
+                    logger.error(f"Error extracting {urls[i]}: {e}")
+                    continue
+                else:
+                    self.profile_stats.merge(stats)
+                    results[i] = self._as_result(content_html)
+                    continue
+            results[i] = self._extract_inline(html, urls[i])
+        return results
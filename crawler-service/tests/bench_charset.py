@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: BeautifulSoup encoding sniffing vs. decoding once with a resolved charset.
+
+For the saved VnExpress/ThanhNien pages and the synthetic live-blog page it
+times parsing raw bytes (UnicodeDammit sniffs the encoding) against
+PageDecoder + parsing the decoded text, and checks both give the same tree.
+
+    python crawler-service/tests/bench_charset.py [repeat]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_dom_cleaning import live_blog_page
+from test_dom_cleaning import FIXTURES, FIXTURE_PAGES
+from bs4 import BeautifulSoup, UnicodeDammit
+from charsets import CharsetCache, PageDecoder
+
+
+def _decode(html, content_type):
+    decoder = PageDecoder(content_type, 'bench.example', CharsetCache())
+    for i in range(0, len(html), 64 * 1024):
+        decoder.feed(html[i:i + 64 * 1024])
+    return decoder.finish()
+
+
+def _time(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    pages = []
+    for name, _ in FIXTURE_PAGES:
+        with open(os.path.join(FIXTURES, name), 'rb') as f:
+            pages.append((name, f.read()))
+    pages.append(('live_blog (synthetic)', live_blog_page()))
+
+    print(f"{'page':<26}{'sniff ms':>10}{'decode ms':>11}{'parse bytes ms':>16}{'parse text ms':>15}  same tree")
+    for name, html in pages:
+        for content_type in ('text/html', 'text/html; charset=utf-8'):
+            sniff, _ = _time(lambda: UnicodeDammit(html, is_html=True).unicode_markup, repeat)
+            decode, text = _time(lambda: _decode(html, content_type), repeat)
+            from_bytes, soup_bytes = _time(lambda: BeautifulSoup(html, 'html.parser'), repeat)
+            from_text, soup_text = _time(lambda: BeautifulSoup(_decode(html, content_type), 'html.parser'), repeat)
+            label = name if content_type == 'text/html' else '  + charset header'
+            print(f"{label:<26}{sniff * 1000:>10.2f}{decode * 1000:>11.2f}{from_bytes * 1000:>16.2f}"
+                  f"{from_text * 1000:>15.2f}  {str(soup_bytes) == str(soup_text)}")
+
+
+if __name__ == '__main__':
+    main()
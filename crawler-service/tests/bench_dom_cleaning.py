@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass DOM cleaning vs. the original multi-pass cleaning.
+
+Runs both over the saved VnExpress/ThanhNien pages plus a synthetic deeply
+nested live-blog page, checks the content HTML is identical and prints timings.
+
+    python crawler-service/tests/bench_dom_cleaning.py [repeat]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from test_dom_cleaning import FIXTURES, FIXTURE_PAGES, ArticleCrawler, LegacyCleaningCrawler
+
+
+def live_blog_page(entries=150, depth=25):
+    """Live-blog style page: every update wrapped in many nested containers"""
+    parts = []
+    for i in range(entries):
+        inner = f'<p>Cập nhật {i}: diễn biến mới nhất của trận đấu, bình luận trực tiếp từ sân vận động.</p>'
+        inner += f'<figure><img data-src="/live/{i}.jpg" alt="Ảnh {i}"><figcaption>Ảnh {i}</figcaption></figure>'
+        for level in range(depth):
+            inner = f'<div class="live-item level-{level}">{inner}</div>'
+        parts.append(inner)
+    return ('<html><body><article class="fck_detail">' + ''.join(parts) +
+            '<div class="box-tinlienquan"><p>Tin liên quan</p></div></article></body></html>').encode('utf-8')
+
+
+def _time(crawler, html, url, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        output = crawler.extract_content(html, url)
+    return (time.perf_counter() - started) / repeat, output
+
+
+def _clean_only(crawler_cls, html, repeat):
+    """Time just _clean_container on a freshly parsed body (parsing excluded)"""
+    from bs4 import BeautifulSoup
+    crawler = crawler_cls()
+    total = 0.0
+    for _ in range(repeat):
+        soup = BeautifulSoup(html, 'html.parser')
+        body = crawler._find_article_body(soup)
+        started = time.perf_counter()
+        crawler._clean_container(body)
+        total += time.perf_counter() - started
+    return total / repeat
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    pages = []
+    for name, url in FIXTURE_PAGES:
+        with open(os.path.join(FIXTURES, name), 'rb') as f:
+            pages.append((name, url, f.read()))
+    pages.append(('live_blog (synthetic)', 'https://vnexpress.net/truc-tiep.html', live_blog_page()))
+
+    print(f"{'page':<26}{'legacy clean ms':>16}{'new clean ms':>14}{'speedup':>9}{'end-to-end ms old/new':>24}  identical")
+    for name, url, html in pages:
+        legacy_clean = _clean_only(LegacyCleaningCrawler, html, repeat)
+        new_clean = _clean_only(ArticleCrawler, html, repeat)
+        legacy_total, legacy_out = _time(LegacyCleaningCrawler(), html, url, repeat)
+        new_total, new_out = _time(ArticleCrawler(), html, url, repeat)
+        print(f"{name:<26}{legacy_clean * 1000:>16.2f}{new_clean * 1000:>14.2f}{legacy_clean / new_clean:>8.1f}x"
+              f"{legacy_total * 1000:>12.1f} / {new_total * 1000:<9.1f}  {legacy_out == new_out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled _is_javascript_content vs. the original keyword scans.
+
+Runs both over every text node of the saved VnExpress/ThanhNien pages (the
+strings the paragraph walker actually checks), checks the answers agree and
+prints per-call timings.
+
+    python crawler-service/tests/bench_js_filter.py [repeat]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from test_js_filter import ArticleCrawler, fixture_text_nodes, legacy_is_javascript_content
+
+
+def _time(check, texts, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        answers = [check(t) for t in texts]
+    return (time.perf_counter() - started) / (repeat * len(texts)), answers
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    texts = fixture_text_nodes()
+    crawler = ArticleCrawler()
+
+    legacy, legacy_answers = _time(legacy_is_javascript_content, texts, repeat)
+    compiled, compiled_answers = _time(crawler._is_javascript_content, texts, repeat)
+
+    print(f"{len(texts)} text nodes, {sum(compiled_answers)} flagged as JavaScript")
+    print(f"{'legacy us/call':>16}{'compiled us/call':>18}{'speedup':>9}  identical")
+    print(f"{legacy * 1e6:>16.2f}{compiled * 1e6:>18.2f}{legacy / compiled:>8.1f}x  {legacy_answers == compiled_answers}")
+
+
+if __name__ == '__main__':
+    main()
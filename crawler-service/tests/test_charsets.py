@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for charsets module
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from charsets import CharsetCache, PageDecoder, header_charset, meta_charset
+
+# Only characters windows-1258 has precomposed, so the legacy encoding round-trips
+TEXT = 'Giá vàng tăng, dân đi mua.'
+
+
+def _decode(body, content_type='text/html', host='a.example', cache=None, chunk=7):
+    decoder = PageDecoder(content_type, host, cache or CharsetCache())
+    for i in range(0, len(body), chunk):
+        decoder.feed(body[i:i + chunk])
+    return decoder.finish(), decoder
+
+
+def test_header_and_meta_parsing():
+    """Test charset names are read from headers and meta tags and normalized"""
+    assert header_charset('text/html; charset="UTF-8"') == 'utf-8'
+    assert header_charset('text/html; charset=x-unknown') is None
+    assert header_charset('text/html') is None
+    assert meta_charset(b'<head><meta charset="windows-1258"></head>') == 'cp1258'
+    assert meta_charset(b'<meta http-equiv="Content-Type" content="text/html; charset=utf-8">') == 'utf-8'
+    assert meta_charset(b'<p>charset=latin-1</p>') is None
+    return True
+
+
+def test_resolution_order():
+    """Test header beats meta, meta beats the host cache, and the cache fills undeclared pages"""
+    print("Testing charset resolution order...")
+
+    cache = CharsetCache()
+    page = f'<html><head><meta charset="windows-1258"></head><body><p>{TEXT}</p></body></html>'
+
+    text, decoder = _decode(page.encode('utf-8'), 'text/html; charset=utf-8', cache=cache)
+    assert text == page and decoder.source == 'header'
+
+    text, decoder = _decode(page.encode('cp1258'), cache=cache)
+    assert text == page and decoder.source == 'meta'
+    assert cache.get('a.example') == 'cp1258'
+
+    bare = f'<html><body><p>{TEXT}</p></body></html>'
+    text, decoder = _decode(bare.encode('cp1258'), cache=cache)
+    assert text == bare and decoder.source == 'domain'
+
+    print("✓ charset resolution order test passed")
+    return True
+
+
+def test_undeclared_pages():
+    """Test undeclared pages decode as UTF-8 or fall back to bytes for sniffing"""
+    bare = f'<html><body><p>{TEXT}</p></body></html>'
+
+    text, decoder = _decode(bare.encode('utf-8'))
+    assert text == bare and decoder.source == 'utf-8'
+
+    body = bare.encode('cp1258')
+    raw, decoder = _decode(body)
+    assert raw == body and decoder.source == 'sniffed'
+
+    # Long page: prescan window passes without a declaration, decision made at the end
+    long_page = ('<p>' + TEXT + '</p>') * 200
+    text, decoder = _decode(long_page.encode('utf-8'), chunk=1000)
+    assert text == long_page and decoder.source == 'utf-8'
+    return True
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Charset Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_header_and_meta_parsing,
+        test_resolution_order,
+        test_undeclared_pages,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
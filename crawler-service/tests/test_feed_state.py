@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit tests for feed_state module
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from feed_state import FeedState, FeedStateStore, MAX_SEEN_GUIDS, hash_body
+import main
+
+FEED = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Tin</title>
+<item><guid>g-a</guid><title>A</title><link>https://a.example/a</link><description>tom tat A</description></item>
+<item><guid>g-b</guid><title>B</title><link>https://a.example/b</link><description>tom tat B</description></item>
+</channel></rss>"""
+
+
+class FakeFeedCrawler:
+    """Stands in for main.web_crawler: serves FEED with an ETag and crawls only ``ok`` links"""
+    last_crawl_memory = {'peak_buffered_bytes': 0, 'max_rss_kb': 0}
+
+    def __init__(self, ok):
+        self.ok = set(ok)
+        self.crawled = []
+
+    def fetch(self, url, verify=True, headers=None):
+        response = Response()
+        unchanged = (headers or {}).get('If-None-Match') == '"v1"'
+        response.status_code = 304 if unchanged else 200
+        response.headers = CaseInsensitiveDict({'ETag': '"v1"'})
+        response._content = b'' if unchanged else FEED
+        return response
+
+    def crawl_many(self, links):
+        self.crawled.extend(links)
+        return [{'success': True, 'content': '<p>day du</p>'} if link in self.ok else None for link in links]
+
+
+def test_conditional_headers_and_unchanged():
+    """Test validators round-trip into request headers and change detection"""
+    print("Testing feed validators...")
+
+    state = FeedState()
+    assert state.conditional_headers() == {}
+    assert not state.is_unchanged(200, b'<rss/>')
+
+    state.update_validators({'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, b'<rss/>')
+    assert state.conditional_headers() == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    assert state.is_unchanged(304, b'')
+    assert state.is_unchanged(200, b'<rss/>')
+    assert not state.is_unchanged(200, b'<rss>new</rss>')
+    assert state.content_hash == hash_body(b'<rss/>')
+
+    print("✓ feed validators test passed")
+    return True
+
+
+def test_remember_dedupes_and_caps():
+    """Test seen entry ids stay unique, newest first and bounded"""
+    print("Testing seen entry tracking...")
+
+    state = FeedState(seen_guids=['b', 'a'])
+    state.remember(['c', 'b', ''])
+    assert state.seen_guids == ['c', 'b', 'a']
+
+    state.remember(str(i) for i in range(MAX_SEEN_GUIDS + 10))
+    assert len(state.seen_guids) == MAX_SEEN_GUIDS
+    assert state.seen_guids[0] == '0'
+
+    print("✓ seen entry tracking test passed")
+    return True
+
+
+def test_store_falls_back_to_memory():
+    """Test state survives in memory when Redis is unreachable"""
+    print("Testing feed state store fallback...")
+
+    store = FeedStateStore('127.0.0.1', 1)
+    url = 'https://vnexpress.net/rss/tin-moi-nhat.rss'
+    assert store.load(url) == FeedState()
+
+    store.save(url, FeedState(etag='"v1"', seen_guids=['g1']))
+    loaded = store.load(url)
+    assert loaded.etag == '"v1"'
+    assert loaded.seen_guids == ['g1']
+
+    print("✓ feed state store fallback test passed")
+    return True
+
+
+def test_failed_crawl_is_retried_next_poll():
+    """Test a page that failed to crawl is neither remembered nor hidden behind the validators"""
+    print("Testing failed crawl retry...")
+
+    crawler, find_ingested = main.web_crawler, main.find_ingested_links
+    main.find_ingested_links = lambda links: set()
+    try:
+        state = FeedState()
+        main.web_crawler = FakeFeedCrawler(ok=['https://a.example/a'])
+        articles = main.fetch_feed('https://a.example/rss', state=state)
+        assert [a['content'] for a in articles] == ['<p>day du</p>', 'tom tat B']
+        assert state.seen_guids == ['g-a']
+        assert state.etag is None and state.content_hash is None
+
+        main.web_crawler = FakeFeedCrawler(ok=['https://a.example/b'])
+        articles = main.fetch_feed('https://a.example/rss', state=state)
+        assert main.web_crawler.crawled == ['https://a.example/b']
+        assert articles[0]['content'] == '<p>day du</p>'
+        assert state.seen_guids == ['g-b', 'g-a']
+        assert state.etag == '"v1"'
+
+        # Everything crawled: the next poll is a 304
+        assert main.fetch_feed('https://a.example/rss', state=state) == []
+    finally:
+        main.web_crawler, main.find_ingested_links = crawler, find_ingested
+
+    print("✓ failed crawl retry test passed")
+    return True
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Feed State Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_conditional_headers_and_unchanged,
+        test_remember_dedupes_and_caps,
+        test_store_falls_back_to_memory,
+        test_failed_crawl_is_retried_next_poll,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Parser parity: content HTML generated with each installed BeautifulSoup backend
+must match the html.parser output over a corpus of saved pages.
+
+Extra saved pages can be added with PARSER_PARITY_CORPUS=/path/to/pages
+(every *.html file in that directory is checked).
+"""
+import difflib
+import glob
+import os
+import re
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from web_crawler import HTML_PARSERS, ArticleCrawler, resolve_parser
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+BASELINE_PARSER = 'html.parser'
+
+
+def corpus_pages():
+    paths = sorted(glob.glob(os.path.join(FIXTURES, '*.html')))
+    extra = os.getenv('PARSER_PARITY_CORPUS')
+    if extra:
+        paths += sorted(glob.glob(os.path.join(extra, '*.html')))
+    return paths
+
+
+def installed_parsers():
+    return [p for p in HTML_PARSERS if p != BASELINE_PARSER and resolve_parser(p) == p]
+
+
+def _normalize(content_html):
+    # Backends differ only in whitespace kept inside copied markup (tables)
+    return re.sub(r'>\s+<', '><', content_html or '').strip()
+
+
+def parity_report(parser, paths):
+    """Return a list of (page, unified diff) for pages whose output differs"""
+    baseline = ArticleCrawler(parser=BASELINE_PARSER)
+    candidate = ArticleCrawler(parser=parser)
+    mismatches = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            html = f.read()
+        url = 'https://example.com/' + os.path.basename(path)
+        expected = baseline.extract_content(html, url) or ''
+        actual = candidate.extract_content(html, url) or ''
+        if _normalize(expected) != _normalize(actual):
+            diff = '\n'.join(difflib.unified_diff(
+                expected.split('\n'), actual.split('\n'),
+                fromfile=BASELINE_PARSER, tofile=parser, lineterm=''
+            ))
+            mismatches.append((os.path.basename(path), diff))
+    return mismatches
+
+
+def test_lxml_matches_html_parser():
+    """Test the lxml backend produces the same content HTML as html.parser"""
+    print("Testing lxml parity...")
+
+    assert resolve_parser('lxml') == 'lxml', "lxml is a declared dependency"
+    mismatches = parity_report('lxml', corpus_pages())
+    assert not mismatches, '\n\n'.join(f'{page}:\n{diff}' for page, diff in mismatches)
+
+    print("✓ lxml parity test passed")
+    return True
+
+
+def test_all_installed_backends_match_html_parser():
+    """Test every other installed backend (e.g. html5lib) against html.parser"""
+    print("Testing parity for installed backends...")
+
+    for parser in installed_parsers():
+        mismatches = parity_report(parser, corpus_pages())
+        assert not mismatches, f'{parser}:\n' + '\n\n'.join(f'{page}:\n{diff}' for page, diff in mismatches)
+
+    print("✓ installed backends parity test passed")
+    return True
+
+
+def test_unknown_parser_rejected():
+    """Test unknown backends fail fast instead of silently parsing differently"""
+    try:
+        ArticleCrawler(parser='xml-fast')
+    except ValueError:
+        return True
+    raise AssertionError("unknown parser accepted")
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Parser Parity Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_lxml_matches_html_parser,
+        test_all_installed_backends_match_html_parser,
+        test_unknown_parser_rejected,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Unit tests for publisher module (RabbitMQ connection is faked)
+"""
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import publisher
+from pika.exceptions import StreamLostError
+
+
+class FakeChannel:
+    def __init__(self, broker):
+        self.broker = broker
+        self.is_open = True
+        self.pending = []
+
+    def queue_declare(self, queue, durable):
+        pass
+
+    def tx_select(self):
+        pass
+
+    def basic_publish(self, exchange, routing_key, body, properties):
+        self.pending.append(body)
+
+    def tx_commit(self):
+        if self.broker.fail_commits:
+            self.broker.fail_commits -= 1
+            self.is_open = False
+            raise StreamLostError('connection reset')
+        self.broker.commits += 1
+        self.broker.messages.extend(self.pending)
+        self.pending = []
+
+
+class FakeBroker:
+    def __init__(self, fail_commits=0):
+        self.fail_commits = fail_commits
+        self.connections = 0
+        self.commits = 0
+        self.messages = []
+
+    def connect(self, parameters):
+        broker = self
+        broker.connections += 1
+
+        class FakeConnection:
+            is_open = True
+
+            def channel(self):
+                return FakeChannel(broker)
+
+            def process_data_events(self, time_limit=None):
+                pass
+
+            def close(self):
+                self.is_open = False
+
+        return FakeConnection()
+
+
+def _publisher(broker, batch_size):
+    publisher.pika.BlockingConnection = broker.connect
+    return publisher.CrawledDataPublisher(parameters=None, batch_size=batch_size)
+
+
+def test_publish_batch_reuses_connection():
+    """Test many messages go over one connection in a few commits"""
+    print("Testing batched publishing...")
+
+    original = publisher.pika.BlockingConnection
+    broker = FakeBroker()
+    try:
+        pub = _publisher(broker, batch_size=20)
+        assert pub.publish_batch([{'title': f't{i}'} for i in range(50)]) == 50
+        assert pub.publish_batch([{'title': 'again'}]) == 1
+    finally:
+        publisher.pika.BlockingConnection = original
+
+    assert broker.connections == 1
+    assert broker.commits == 4  # 20 + 20 + 10, then 1
+    assert json.loads(broker.messages[0]) == {'title': 't0'}
+    assert pub.stats['published'] == 51
+    assert pub.messages_per_second() > 0
+
+    print("✓ batched publishing test passed")
+    return True
+
+
+def test_publish_batch_reconnects():
+    """Test a lost connection is re-established and the chunk retried"""
+    print("Testing publisher reconnect...")
+
+    original = publisher.pika.BlockingConnection
+    broker = FakeBroker(fail_commits=1)
+    try:
+        pub = _publisher(broker, batch_size=10)
+        assert pub.publish_batch([{'n': i} for i in range(5)]) == 5
+    finally:
+        publisher.pika.BlockingConnection = original
+
+    assert broker.connections == 2
+    assert len(broker.messages) == 5
+    assert pub.stats['reconnects'] == 1
+    assert pub.stats['failed'] == 0
+
+    print("✓ publisher reconnect test passed")
+    return True
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Publisher Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_publish_batch_reuses_connection,
+        test_publish_batch_reconnects,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
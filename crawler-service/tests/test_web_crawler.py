@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Unit tests for web_crawler module (no network access required)
+"""
+import sys
+import os
+import io
+import signal
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bs4 import BeautifulSoup
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from web_crawler import ArticleCrawler, DownloadRejected
+
+
+class SlowCrawler(ArticleCrawler):
+    """ArticleCrawler whose page fetch just sleeps and records concurrency"""
+    def __init__(self, delay=0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.peak = {}
+
+    def crawl_article(self, url):
+        host = url.split('/')[2]
+        with self.lock:
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.in_flight[host])
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight[host] -= 1
+        return {'content': f'<p>{url}</p>', 'success': True}
+
+
+def test_crawl_many_preserves_order():
+    """Test results come back in the same order as the input links"""
+    print("Testing crawl_many order...")
+
+    crawler = SlowCrawler(max_workers=8, max_per_host=8)
+    urls = [f'https://a.example/{i}' for i in range(10)]
+    results = crawler.crawl_many(urls)
+
+    assert [r['content'] for r in results] == [f'<p>{u}</p>' for u in urls]
+
+    print("✓ crawl_many order test passed")
+    return True
+
+
+def test_crawl_many_limits():
+    """Test global and per-host concurrency limits are respected"""
+    print("Testing crawl_many concurrency limits...")
+
+    crawler = SlowCrawler(max_workers=6, max_per_host=2)
+    urls = [f'https://a.example/{i}' for i in range(6)] + [f'https://b.example/{i}' for i in range(6)]
+
+    started = time.perf_counter()
+    crawler.crawl_many(urls)
+    elapsed = time.perf_counter() - started
+
+    assert crawler.peak['a.example'] <= 2
+    assert crawler.peak['b.example'] <= 2
+    # 12 pages, 4 at a time -> ~3 rounds instead of 12 sequential fetches
+    assert elapsed < crawler.delay * 12
+
+    print("✓ crawl_many concurrency limits test passed")
+    return True
+
+
+def test_crawl_many_empty():
+    """Test crawl_many with no links"""
+    assert ArticleCrawler().crawl_many([]) == []
+    return True
+
+
+def test_session_is_pooled_and_reused():
+    """Test the crawler keeps one keep-alive session with per-host pool sizing"""
+    print("Testing pooled session...")
+
+    crawler = ArticleCrawler(max_per_host=3, retries=4)
+    adapter = crawler.session.get_adapter('https://vnexpress.net/')
+
+    assert adapter is crawler.session.get_adapter('https://thanhnien.vn/')
+    assert adapter._pool_maxsize == 3
+    assert adapter.max_retries.total == 4
+    assert 'gzip' in crawler.session.headers['Accept-Encoding']
+
+    print("✓ pooled session test passed")
+    return True
+
+
+def test_profile_goes_straight_to_body():
+    """Test known hosts use their profile and unknown hosts the generic cascade"""
+    print("Testing extraction profiles...")
+
+    html = """<html><body>
+    <article class="item-news"><p>Tin khác trong sidebar</p></article>
+    <article class="fck_detail"><p>Nội dung chính của bài viết.</p></article>
+    </body></html>"""
+    crawler = ArticleCrawler()
+
+    soup = BeautifulSoup(html, 'html.parser')
+    assert crawler._find_article_body(soup, 'https://vnexpress.net/a.html')['class'] == ['fck_detail']
+    soup = BeautifulSoup(html, 'html.parser')
+    assert crawler._find_article_body(soup, 'https://example.com/a')['class'] == ['item-news']
+    soup = BeautifulSoup('<div class="x"><p>chỉ có div</p></div>', 'html.parser')
+    assert crawler._find_article_body(soup, 'https://thanhnien.vn/a.htm') is not None
+
+    stats = crawler.profile_stats.snapshot()
+    assert stats['vnexpress'] == {'hit': 1, 'miss': 0}
+    assert stats['thanhnien'] == {'hit': 0, 'miss': 1}
+    assert stats['generic'] == {'hit': 1, 'miss': 0}
+
+    print("✓ extraction profiles test passed")
+    return True
+
+
+def test_largest_text_div_matches_get_text():
+    """Test the one-pass fallback picks the same div as max(get_text) over all divs"""
+    html = """<html><body>
+    <div><div><span>ngắn</span></div></div>
+    <div><div><p>đoạn văn dài hơn một chút</p><script>var x = 1;</script></div></div>
+    <div><p>đoạn văn dài hơn một chút</p></div>
+    </body></html>"""
+    soup = BeautifulSoup(html, 'html.parser')
+    expected = max(soup.find_all('div'), key=lambda d: len(d.get_text(strip=True)))
+    assert ArticleCrawler()._largest_text_div(soup) is expected
+    return True
+
+
+class FixtureCrawler(ArticleCrawler):
+    """ArticleCrawler that serves pages from tests/fixtures instead of the network"""
+    PAGES = {
+        'https://vnexpress.net/a.html': 'vnexpress_article.html',
+        'https://thanhnien.vn/b.htm': 'thanhnien_article.html',
+    }
+
+    def download(self, url):
+        if url not in self.PAGES:
+            raise IOError(f'404 {url}')
+        with open(os.path.join(os.path.dirname(__file__), 'fixtures', self.PAGES[url]), 'rb') as f:
+            return f.read()
+
+
+def test_crawl_many_extracts_in_process_pool():
+    """Test the process-pool extraction stage matches inline extraction"""
+    print("Testing process-pool extraction...")
+
+    urls = list(FixtureCrawler.PAGES) + ['https://vnexpress.net/missing.html']
+    inline = FixtureCrawler().crawl_many(urls)
+    pooled_crawler = FixtureCrawler(extract_workers=2)
+    try:
+        pooled = pooled_crawler.crawl_many(urls)
+    finally:
+        pooled_crawler.close()
+
+    assert inline[0]['success'] and inline[1]['success']
+    assert inline[2] is None
+    assert pooled == inline
+    # Profile counters from worker processes are merged back into the parent
+    assert pooled_crawler.profile_stats.snapshot()['vnexpress'] == {'hit': 1, 'miss': 0}
+
+    print("✓ process-pool extraction test passed")
+    return True
+
+
+def test_dead_extraction_worker_is_replaced():
+    """Test a killed pool worker neither fails the batch nor breaks later crawls"""
+    print("Testing dead extraction worker recovery...")
+
+    urls = list(FixtureCrawler.PAGES)
+    inline = FixtureCrawler().crawl_many(urls)
+    crawler = FixtureCrawler(extract_workers=2)
+    try:
+        assert crawler.crawl_many(urls) == inline
+        pool = crawler._extract_pool
+        os.kill(next(iter(pool._processes)), signal.SIGKILL)
+        deadline = time.monotonic() + 10
+        while not pool._broken and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool._broken
+
+        # The batch that finds the pool dead is extracted inline
+        assert crawler.crawl_many(urls) == inline
+        assert crawler._extract_pool is None
+        # The next batch gets a fresh pool
+        assert crawler.crawl_many(urls) == inline
+        assert crawler._extract_pool is not None and crawler._extract_pool is not pool
+    finally:
+        crawler.close()
+
+    print("✓ dead extraction worker recovery test passed")
+    return True
+
+
+class FakePageAdapter(BaseAdapter):
+    """Transport adapter answering from a dict of url -> (headers, body)"""
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.bytes_read = {}
+
+    def send(self, request, **kwargs):
+        headers, body = self.pages[request.url]
+        adapter = self
+
+        class CountingBody(io.BytesIO):
+            def read(self, size=-1):
+                data = super().read(size)
+                adapter.bytes_read[request.url] = adapter.bytes_read.get(request.url, 0) + len(data)
+                return data
+
+        response = Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = CountingBody(body)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def test_download_streams_with_limits():
+    """Test downloads stop early on oversized or non-HTML pages and decode by header charset"""
+    print("Testing streaming downloads...")
+
+    page = '<html><body><div class="content"><p>Tiếng Việt có dấu</p></div></body></html>'
+    huge = b'<p>' + b'x' * (1024 * 1024) + b'</p>'
+    adapter = FakePageAdapter({
+        'https://a.example/ok': ({'Content-Type': 'text/html; charset=UTF-8'}, page.encode('utf-8')),
+        'https://a.example/raw': ({'Content-Type': 'text/html'}, page.encode('utf-8')),
+        'https://a.example/pdf': ({'Content-Type': 'application/pdf'}, b'%PDF' * 1000),
+        'https://a.example/big': ({'Content-Type': 'text/html', 'Content-Length': str(len(huge))}, huge),
+        'https://a.example/chunked': ({'Content-Type': 'text/html'}, huge),
+    })
+    crawler = ArticleCrawler(max_body_bytes=256 * 1024)
+    crawler.session.mount('https://', adapter)
+
+    assert crawler.download('https://a.example/ok') == page
+    assert crawler.download('https://a.example/raw') == page
+    for url, reason in (('https://a.example/pdf', 'content_type'),
+                        ('https://a.example/big', 'too_large'),
+                        ('https://a.example/chunked', 'too_large')):
+        try:
+            crawler.download(url)
+            assert False, f'{url} should be rejected'
+        except DownloadRejected as e:
+            assert e.reason == reason
+
+    assert adapter.bytes_read.get('https://a.example/pdf', 0) == 0
+    assert adapter.bytes_read.get('https://a.example/big', 0) == 0
+    # Aborted within one chunk of the cap instead of reading the whole megabyte
+    assert adapter.bytes_read['https://a.example/chunked'] <= 256 * 1024 + 64 * 1024
+    assert crawler.download_stats['rejected_too_large'] == 2
+    assert crawler.download_stats['rejected_content_type'] == 1
+
+    results = crawler.crawl_many(['https://a.example/ok', 'https://a.example/chunked'])
+    assert results[0]['success'] and results[1] is None
+    assert 0 < crawler.last_crawl_memory['peak_buffered_bytes'] <= 2 * (256 * 1024 + 64 * 1024)
+    assert crawler.last_crawl_memory['max_rss_kb'] > 0
+
+    print("✓ streaming downloads test passed")
+    return True
+
+
+def run_tests():
+    """Run all tests"""
+    print("\n" + "="*50)
+    print("Running Web Crawler Tests")
+    print("="*50 + "\n")
+
+    tests = [
+        test_crawl_many_preserves_order,
+        test_crawl_many_limits,
+        test_crawl_many_empty,
+        test_session_is_pooled_and_reused,
+        test_profile_goes_straight_to_body,
+        test_largest_text_div_matches_get_text,
+        test_crawl_many_extracts_in_process_pool,
+        test_dead_extraction_worker_is_replaced,
+        test_download_streams_with_limits,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*50)
+    print(f"Tests completed: {passed} passed, {failed} failed")
+    print("="*50 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_tests()
+    sys.exit(0 if success else 1)
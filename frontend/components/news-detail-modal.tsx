@@ -3,7 +3,7 @@
 import { Article } from '@/lib/api';
 import { Calendar, Globe, Tag, X, ExternalLink, Bookmark, History } from 'lucide-react';
 import { useEffect, useState } from 'react';
-import { useRelatedArticles } from '@/hooks/use-articles';
+import { useArticle, useRelatedArticles } from '@/hooks/use-articles';
 import { Button } from './ui/button';
 import { useAuth } from './providers/auth-provider';
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
@@ -17,6 +17,8 @@ interface NewsDetailModalProps {
 
 export default function NewsDetailModal({ article, isOpen, onClose, onArticleSelect }: NewsDetailModalProps) {
     const { data: relatedArticles, isLoading: isLoadingRelated } = useRelatedArticles(article?.id || 0);
+    // List items carry no body; the full content comes from the article endpoint
+    const { data: fullArticle } = useArticle(isOpen ? article?.id || 0 : 0);
     const { user } = useAuth();
     const [isSaved, setIsSaved] = useState(false);
     const queryClient = useQueryClient();
@@ -203,7 +205,7 @@ export default function NewsDetailModal({ article, isOpen, onClose, onArticleSel
                         {/* Article Body */}
                         <div
                             className="prose prose-lg max-w-none text-gray-900 leading-relaxed"
-                            dangerouslySetInnerHTML={{ __html: article.content || '<p className="italic text-gray-500">Nội dung đầy đủ chưa có.</p>' }}
+                            dangerouslySetInnerHTML={{ __html: fullArticle?.content || article.content || '<p className="italic text-gray-500">Nội dung đầy đủ chưa có.</p>' }}
                         />
 
                         {/* Footer Links */}
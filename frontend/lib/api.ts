@@ -21,6 +21,7 @@ export interface Article {
   title: string;
   link: string;
   published?: string;
+  published_at?: string;
   summary?: string;
   image_url?: string;
   category?: string;
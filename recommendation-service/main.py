@@ -45,11 +45,21 @@ logger.info("Model loaded successfully")
 
 qdrant_client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
 
+ENCODE_BATCH_SIZE = int(os.getenv('ENCODE_BATCH_SIZE', '64'))
+
 # Pydantic models
 class ArticleUpsert(BaseModel):
     id: int
     title: str
     content: str
+    # Embedding already computed by the caller with `model`; reused instead of encoding again
+    vector: Optional[List[float]] = None
+    model: Optional[str] = None
+    # Fingerprint of the article text; an indexed point with the same one is left as is
+    content_hash: Optional[str] = None
+
+class ArticleUpsertBatch(BaseModel):
+    articles: List[ArticleUpsert]
 
 class SemanticSearchRequest(BaseModel):
     query: str
@@ -98,12 +108,53 @@ def health():
         "model": MODEL_NAME
     }
 
+def _article_text(article: ArticleUpsert) -> str:
+    """Combined text for embedding"""
+    return f"{article.title} {article.content}".strip()
+
+def _reusable_vector(article: ArticleUpsert) -> Optional[List[float]]:
+    """Caller's embedding, if it comes from the same model"""
+    if (
+        article.vector is not None
+        and article.model == MODEL_NAME
+        and len(article.vector) == model.get_sentence_embedding_dimension()
+    ):
+        return article.vector
+    return None
+
+def _article_point(article: ArticleUpsert, embedding: List[float]) -> PointStruct:
+    return PointStruct(
+        id=article.id,
+        vector=embedding,
+        payload={
+            "title": article.title,
+            "content": article.content[:500] if article.content else "",  # Store first 500 chars
+            "content_hash": article.content_hash
+        }
+    )
+
+def _unchanged_ids(articles: List[ArticleUpsert]) -> set:
+    """Ids whose indexed point already carries the same content_hash"""
+    hashes = {a.id: a.content_hash for a in articles if a.content_hash}
+    if not hashes:
+        return set()
+    points = qdrant_client.retrieve(
+        collection_name=COLLECTION_NAME,
+        ids=list(hashes),
+        with_payload=["content_hash"],
+        with_vectors=False
+    )
+    return {
+        p.id for p in points
+        if p.payload and p.payload.get("content_hash") == hashes.get(p.id)
+    }
+
 @app.post("/api/v1/vectors/upsert")
 def upsert_article(article: ArticleUpsert):
     """Create embedding for article and store in Qdrant"""
     try:
         # Create combined text for embedding
-        text = f"{article.title} {article.content}".strip()
+        text = _article_text(article)
         
         if not text:
             logger.warning(f"Skipping article {article.id}: no content to embed")
@@ -113,35 +164,101 @@ def upsert_article(article: ArticleUpsert):
                 "message": "No content to embed"
             }
         
-        # Generate embedding
-        embedding = model.encode(text).tolist()
+        # Reuse the caller's embedding when it comes from the same model
+        embedding = _reusable_vector(article)
+        if embedding is not None:
+            embedding_source = "reused"
+        else:
+            embedding = model.encode(text).tolist()
+            embedding_source = "computed"
         
         # Upsert to Qdrant
         qdrant_client.upsert(
             collection_name=COLLECTION_NAME,
-            points=[
-                PointStruct(
-                    id=article.id,
-                    vector=embedding,
-                    payload={
-                        "title": article.title,
-                        "content": article.content[:500] if article.content else ""  # Store first 500 chars
-                    }
-                )
-            ]
+            points=[_article_point(article, embedding)]
         )
         
-        logger.info(f"Upserted article {article.id}: {article.title}")
+        logger.info(f"Upserted article {article.id} ({embedding_source} embedding): {article.title}")
         
         return {
             "status": "success",
             "id": article.id,
-            "message": "Article indexed successfully"
+            "message": "Article indexed successfully",
+            "embedding": embedding_source
         }
     except Exception as e:
         logger.error(f"Error upserting article: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/v1/vectors/upsert/batch")
+def upsert_articles_batch(batch: ArticleUpsertBatch):
+    """Embed many articles in one batched encode and store them with one Qdrant upsert"""
+    results = []
+    embeddings = {}
+    sources = {}
+    to_encode = []
+    try:
+        unchanged = _unchanged_ids(batch.articles)
+    except Exception as e:
+        logger.warning(f"Could not check content hashes, re-indexing the whole batch: {e}")
+        unchanged = set()
+    for i, article in enumerate(batch.articles):
+        text = _article_text(article)
+        if not text:
+            results.append({"status": "skipped", "id": article.id, "message": "No content to embed"})
+            continue
+        if article.id in unchanged:
+            results.append({"status": "unchanged", "id": article.id, "message": "Already indexed with this content"})
+            continue
+        results.append(None)
+        vector = _reusable_vector(article)
+        if vector is not None:
+            embeddings[i], sources[i] = vector, "reused"
+        else:
+            to_encode.append((i, text))
+
+    try:
+        if to_encode:
+            encoded = model.encode(
+                [text for _, text in to_encode],
+                batch_size=ENCODE_BATCH_SIZE
+            )
+            for (i, _), vector in zip(to_encode, encoded):
+                embeddings[i], sources[i] = vector.tolist(), "computed"
+
+        if embeddings:
+            qdrant_client.upsert(
+                collection_name=COLLECTION_NAME,
+                points=[_article_point(batch.articles[i], embeddings[i]) for i in sorted(embeddings)]
+            )
+    except Exception as e:
+        logger.error(f"Error upserting batch of {len(batch.articles)} articles: {e}")
+        for i, result in enumerate(results):
+            if result is not None:
+                continue
+            results[i] = {"status": "error", "id": batch.articles[i].id, "message": str(e)}
+    else:
+        for i in embeddings:
+            results[i] = {
+                "status": "success",
+                "id": batch.articles[i].id,
+                "message": "Article indexed successfully",
+                "embedding": sources[i]
+            }
+
+    indexed = sum(1 for r in results if r["status"] == "success")
+    skipped_unchanged = sum(1 for r in results if r["status"] == "unchanged")
+    logger.info(
+        f"Batch upsert: {indexed}/{len(results)} indexed, {len(to_encode)} encoded, "
+        f"{skipped_unchanged} unchanged"
+    )
+    return {
+        "indexed": indexed,
+        "unchanged": skipped_unchanged,
+        "count": len(results),
+        "results": results
+    }
+
 @app.post("/api/v1/search/semantic")
 def semantic_search(request: SemanticSearchRequest):
     """Search articles using natural language query"""